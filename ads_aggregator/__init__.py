@@ -6,7 +6,11 @@
 - MetaAdsClient: клиент для Meta Ads API
 - GoogleAdsClient: клиент для Google Ads API  
 - AdsAggregator: агрегатор данных
+- DataIndex: индекс агрегированных данных для повторных фильтраций
+- Campaign, Ad: компактные записи агрегированных данных
+- Creative: неизменяемый креатив ротатора
 - CreativeRotator: система ротации креативов
+- SimulationResult: результат симуляции ротации
 """
 
 __version__ = "1.0.0"
@@ -14,8 +18,9 @@ __author__ = "Python Backend Developer"
 __email__ = "developer@example.com"
 
 # Основные классы для импорта
-from .aggregator import AdsAggregator
-from .rotator import CreativeRotator, RotationStrategy
+from .aggregator import AdsAggregator, DataIndex
+from .models import Ad, Campaign, Creative
+from .rotator import CreativeRotator, RotationStrategy, SimulationResult
 from .exceptions import (
     AdsAPIError,
     AuthenticationError, 
@@ -31,8 +36,13 @@ from .clients.google_ads_client import GoogleAdsClient
 
 __all__ = [
     "AdsAggregator",
+    "DataIndex",
+    "Ad",
+    "Campaign",
+    "Creative",
     "CreativeRotator", 
     "RotationStrategy",
+    "SimulationResult",
     "BaseAdsClient",
     "MetaAdsClient",
     "GoogleAdsClient",
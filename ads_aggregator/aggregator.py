@@ -1,10 +1,82 @@
+import asyncio
+import contextvars
 import json
-from typing import List, Dict, Optional
+import os
+import threading
+from typing import BinaryIO, Iterator, List, Dict, Optional
 from datetime import date
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
-from .clients.base_client import BaseAdsClient
+import numpy as np
+from bisect import bisect_left
+from itertools import islice
+from collections import defaultdict, deque
+from operator import itemgetter
+from .batcher import AdsBatcher
+from .clients.base_client import BaseAdsClient, dates_validated, validate_date_range
 from .exceptions import AdsAPIError
+from .models import Campaign
+
+try:
+    import orjson
+except ImportError:  # orjson опционален, используем stdlib json
+    orjson = None
+
+# Начиная с этого количества кампаний сводная статистика считается на NumPy
+_NUMPY_STATS_THRESHOLD = 1000
+
+# Колонки, собираемые из кампаний за один проход для NumPy-статистики
+_STATS_COLUMNS_DTYPE = np.dtype([
+    ('code', np.int64),
+    ('impressions', np.int64),
+    ('clicks', np.int64),
+    ('spend', np.float64),
+    ('ads', np.int64),
+])
+
+# Поля кампании, переносимые в унифицированную структуру (извлекаются одним C-вызовом)
+_campaign_fields = itemgetter('campaign_id', 'name', 'impressions', 'clicks', 'spend')
+_get_spend = itemgetter('spend')
+
+
+def _copy_ads(ads: List[Dict]) -> List[Dict]:
+    """
+    Копирует объявления из ответа клиента.
+
+    Ответы клиентов кэшируются и общие для всех вызовов: результат
+    агрегации получает собственные списки и словари, поэтому его
+    изменение не портит кэш. Объявления плоские, поверхностной копии
+    каждого словаря достаточно.
+    """
+    return [dict(ad) for ad in ads]
+
+
+def _raise_if_fatal(result: BaseException) -> None:
+    """
+    Пробрасывает результат gather, который не является ошибкой клиента.
+
+    CancelledError (и KeyboardInterrupt) наследуют BaseException, а не
+    Exception: это отмена агрегации, а не данные и не сбой платформы.
+    """
+    if not isinstance(result, Exception):
+        raise result
+
+
+def _json_default(obj):
+    """Сериализация записей models и SimulationResult ротатора."""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if hasattr(obj, 'to_list'):
+        return obj.to_list()
+    raise TypeError(f"Объект типа {type(obj).__name__} не сериализуется в JSON")
+
+
+def _dumps(obj) -> bytes:
+    """Сериализует объект в компактный JSON (UTF-8 байты)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'),
+                      default=_json_default).encode('utf-8')
 
 
 class AdsAggregator:
@@ -13,20 +85,67 @@ class AdsAggregator:
 
     Принимает список клиентов рекламных платформ и возвращает 
     унифицированный JSON с данными по кампаниям и креативам.
+
+    Пул потоков для параллельных запросов создается один раз и
+    переиспользуется между вызовами aggregate_data. В долгоживущих
+    процессах используйте агрегатор как контекстный менеджер
+    (with AdsAggregator(...) as aggregator) или вызывайте close().
     """
 
-    def __init__(self, clients: List[BaseAdsClient]):
+    def __init__(self, clients: List[BaseAdsClient], batch_size: int = 50,
+                 max_workers: Optional[int] = None, parallel_default: bool = True):
         """
         Инициализация агрегатора.
 
         Args:
             clients: Список экземпляров клиентов рекламных платформ
+            batch_size: Максимальное количество кампаний в одном запросе объявлений
+            max_workers: Количество потоков для параллельных запросов. По умолчанию
+                берется из переменной окружения ADS_MAX_WORKERS (2, если не задана);
+                от числа клиентов не зависит: пачки объявлений одного клиента
+                тоже запрашиваются параллельно
+            parallel_default: Использовать ли параллельные запросы, если
+                parallel не передан в aggregate_data
         """
         self.clients = clients
+        self.batch_size = batch_size
+        self.parallel_default = parallel_default
         self.logger = logging.getLogger(__name__)
 
-    def aggregate_data(self, start_date: date, end_date: date, 
-                      parallel: bool = True) -> List[Dict]:
+        self._workers = max_workers or max(1, int(os.environ.get('ADS_MAX_WORKERS', '2')))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def __enter__(self) -> "AdsAggregator":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __del__(self):
+        executor = getattr(self, '_executor', None)
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def close(self) -> None:
+        """Останавливает пул потоков агрегатора."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Возвращает пул потоков, создавая его при первом обращении."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._workers, thread_name_prefix='ads-agg'
+                    )
+        return self._executor
+
+    def aggregate_data(self, start_date: date, end_date: date,
+                      parallel: Optional[bool] = None) -> List[Dict]:
         """
         Агрегирует данные со всех подключенных платформ.
 
@@ -34,34 +153,27 @@ class AdsAggregator:
             start_date: Дата начала периода
             end_date: Дата окончания периода
             parallel: Использовать ли параллельные запросы
+                (по умолчанию parallel_default)
 
         Returns:
             Список объединенных данных в формате JSON
 
         Raises:
+            ValueError: При некорректном диапазоне дат
             AdsAPIError: При критических ошибках API
         """
+        # Диапазон проверяется один раз, методы клиентов проверку пропускают
+        validate_date_range(start_date, end_date)
         all_data = []
 
-        if parallel and len(self.clients) > 1:
-            # Параллельная обработка для ускорения запросов
-            with ThreadPoolExecutor(max_workers=min(len(self.clients), 4)) as executor:
-                future_to_client = {
-                    executor.submit(self._fetch_client_data, client, start_date, end_date): client
-                    for client in self.clients
-                }
-
-                for future in as_completed(future_to_client):
-                    client = future_to_client[future]
-                    try:
-                        platform_data = future.result()
-                        all_data.extend(platform_data)
-                        self.logger.info(f"Успешно получены данные из {client.platform_name}")
-                    except Exception as e:
-                        self.logger.error(f"Ошибка получения данных из {client.platform_name}: {e}")
-                        # Продолжаем с другими платформами
-                        continue
-        else:
+        if parallel is None:
+            parallel = self.parallel_default
+
+        with dates_validated():
+            if parallel and self._workers > 1:
+                # Параллельная обработка для ускорения запросов
+                return self._aggregate_parallel(start_date, end_date)
+
             # Последовательная обработка
             for client in self.clients:
                 try:
@@ -74,6 +186,171 @@ class AdsAggregator:
 
         return all_data
 
+    def _aggregate_parallel(self, start_date: date, end_date: date) -> List[Dict]:
+        """
+        Параллельно получает данные всех платформ через общий пул потоков.
+
+        Сначала параллельно запрашиваются кампании всех клиентов, затем
+        пачки объявлений всех кампаний всех клиентов отправляются в пул
+        одним плоским списком задач. Время ожидания определяется общим
+        числом пачек на поток, а не суммой запросов по каждому клиенту.
+
+        Args:
+            start_date: Дата начала
+            end_date: Дата окончания
+
+        Returns:
+            Форматированные данные кампаний с объявлениями
+        """
+        executor = self._get_executor()
+
+        # Этап 1: кампании всех платформ
+        campaign_futures = {
+            self._submit(executor, client.fetch_campaigns, start_date, end_date): client
+            for client in self.clients
+        }
+        campaigns_by_client = {}
+
+        for future in as_completed(campaign_futures):
+            client = campaign_futures[future]
+            try:
+                campaigns_by_client[client] = future.result()
+            except Exception as e:
+                self.logger.error(f"Ошибка получения данных из {client.platform_name}: {e}")
+                # Продолжаем с другими платформами
+                continue
+
+        # Этап 2: объявления всех кампаний, пачками по batch_size
+        ads_futures = {
+            self._submit(executor, client.fetch_ads_bulk, [c['campaign_id'] for c in batch],
+                         start_date, end_date): (client, batch)
+            for client, batch in self._split_batches(campaigns_by_client)
+        }
+
+        ads_by_campaign = {}
+        for future in as_completed(ads_futures):
+            client, batch = ads_futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                self._log_batch_error(batch, e)
+                continue
+
+            for campaign in batch:
+                ads_by_campaign[(client, campaign['campaign_id'])] = results.get(campaign['campaign_id'], [])
+
+        return self._assemble(campaigns_by_client, ads_by_campaign)
+
+    def aggregate_records(self, start_date: date, end_date: date,
+                          parallel: Optional[bool] = None) -> List[Campaign]:
+        """
+        Агрегирует данные и возвращает их в виде компактных записей.
+
+        Campaign и Ad - dataclass со __slots__: занимают меньше памяти,
+        чем словари, и быстрее при доступе к полям. Подходят для
+        долго хранимых или больших выборок; to_json/to_json_bytes
+        сериализуют их напрямую.
+
+        Args:
+            start_date: Дата начала периода
+            end_date: Дата окончания периода
+            parallel: Использовать ли параллельные запросы
+                (по умолчанию parallel_default)
+
+        Returns:
+            Список кампаний (models.Campaign)
+        """
+        return [Campaign.from_dict(campaign)
+                for campaign in self.aggregate_data(start_date, end_date, parallel)]
+
+    async def aggregate_data_async(self, start_date: date, end_date: date) -> List[Dict]:
+        """
+        Асинхронно агрегирует данные со всех платформ.
+
+        Работает как параллельная агрегация, но вместо пула потоков
+        использует asyncio.gather: сначала кампании всех клиентов,
+        затем все пачки объявлений одним плоским списком корутин.
+
+        Args:
+            start_date: Дата начала периода
+            end_date: Дата окончания периода
+
+        Returns:
+            Список кампаний с объявлениями в унифицированном формате
+        """
+        validate_date_range(start_date, end_date)
+
+        # Задачи gather наследуют контекст, поэтому клиенты не проверяют даты повторно
+        with dates_validated():
+            results = await asyncio.gather(
+                *(client.fetch_campaigns_async(start_date, end_date) for client in self.clients),
+                return_exceptions=True
+            )
+            campaigns_by_client = {}
+
+            for client, result in zip(self.clients, results):
+                if isinstance(result, BaseException):
+                    _raise_if_fatal(result)
+                    self.logger.error(f"Ошибка получения данных из {client.platform_name}: {result}")
+                    continue
+                campaigns_by_client[client] = result
+
+            batches = list(self._split_batches(campaigns_by_client))
+            results = await asyncio.gather(
+                *(client.fetch_ads_bulk_async([c['campaign_id'] for c in batch], start_date, end_date)
+                  for client, batch in batches),
+                return_exceptions=True
+            )
+
+            ads_by_campaign = {}
+            for (client, batch), result in zip(batches, results):
+                if isinstance(result, BaseException):
+                    _raise_if_fatal(result)
+                    self._log_batch_error(batch, result)
+                    continue
+
+                for campaign in batch:
+                    ads_by_campaign[(client, campaign['campaign_id'])] = result.get(campaign['campaign_id'], [])
+
+        return self._assemble(campaigns_by_client, ads_by_campaign)
+
+    @staticmethod
+    def _submit(executor: ThreadPoolExecutor, fn, *args):
+        """Отправляет задачу в пул, сохраняя текущий контекст (contextvars)."""
+        return executor.submit(contextvars.copy_context().run, fn, *args)
+
+    def _split_batches(self, campaigns_by_client: Dict[BaseAdsClient, List[Dict]]):
+        """Разбивает кампании каждого клиента на пачки по batch_size."""
+        for client, campaigns in campaigns_by_client.items():
+            for i in range(0, len(campaigns), self.batch_size):
+                yield client, campaigns[i:i + self.batch_size]
+
+    def _log_batch_error(self, batch: List[Dict], error: Exception) -> None:
+        """Логирует ошибку получения объявлений для каждой кампании пачки."""
+        for campaign in batch:
+            self.logger.error(
+                f"Ошибка получения объявлений для кампании {campaign['campaign_id']}: {error}"
+            )
+
+    def _assemble(self, campaigns_by_client: Dict[BaseAdsClient, List[Dict]],
+                  ads_by_campaign: Dict) -> List[Dict]:
+        """Собирает результат в порядке клиентов и кампаний."""
+        all_data = []
+        for client in self.clients:
+            if client not in campaigns_by_client:
+                continue
+
+            platform = client.platform_name
+            for campaign in campaigns_by_client[client]:
+                formatted_campaign = self._format_campaign(platform, campaign)
+                formatted_campaign['ads'] = _copy_ads(
+                    ads_by_campaign.get((client, formatted_campaign['campaign_id']), [])
+                )
+                all_data.append(formatted_campaign)
+            self.logger.info(f"Успешно получены данные из {client.platform_name}")
+
+        return all_data
+
     def _fetch_client_data(self, client: BaseAdsClient, 
                           start_date: date, end_date: date) -> List[Dict]:
         """
@@ -87,51 +364,87 @@ class AdsAggregator:
         Returns:
             Форматированные данные кампаний с объявлениями
         """
-        platform_data = []
+        return list(self._iter_client_data(client, start_date, end_date))
 
+    def _iter_client_data(self, client: BaseAdsClient,
+                          start_date: date, end_date: date) -> Iterator[Dict]:
+        """
+        Отдает форматированные кампании клиента по мере получения объявлений.
+
+        В батчер ставится не больше двух пачек кампаний вперед: следующая
+        пачка отправляется, когда до конца уже запрошенных осталась одна,
+        поэтому ответы не копятся в Future быстрее, чем их забирают.
+
+        Args:
+            client: Экземпляр клиента платформы
+            start_date: Дата начала
+            end_date: Дата окончания
+
+        Yields:
+            Кампания с объявлениями в унифицированном формате
+        """
         # Получаем кампании
         campaigns = client.fetch_campaigns(start_date, end_date)
 
-        for campaign in campaigns:
-            # Получаем объявления для каждой кампании
-            try:
-                ads = client.fetch_ads(campaign['campaign_id'], start_date, end_date)
-
-                # Формируем унифицированную структуру данных
-                formatted_campaign = {
-                    "platform": client.platform_name,
-                    "campaign_id": campaign['campaign_id'],
-                    "name": campaign['name'],
-                    "impressions": campaign['impressions'],
-                    "clicks": campaign['clicks'],
-                    "spend": campaign['spend'],
-                    "ads": ads
-                }
+        # Запрашиваем объявления пачками вместо отдельного запроса на каждую кампанию
+        platform = client.platform_name
+        window = 2 * self.batch_size
+        with AdsBatcher(client, start_date, end_date, max_batch_size=self.batch_size) as batcher:
+            pending = iter(campaigns)
+            futures: deque = deque()
+
+            for campaign in campaigns:
+                if len(futures) <= self.batch_size:
+                    # Целая пачка за раз, чтобы батчер не дробил запросы
+                    futures.extend(
+                        batcher.submit(item['campaign_id'])
+                        for item in islice(pending, window - len(futures))
+                    )
+
+                # Забираем Future из очереди, чтобы не держать уже отданные объявления
+                future = futures.popleft()
+                formatted_campaign = self._format_campaign(platform, campaign)
+                try:
+                    formatted_campaign['ads'] = _copy_ads(future.result())
+                except Exception as e:
+                    # Кампания остается без объявлений
+                    self.logger.error(
+                        f"Ошибка получения объявлений для кампании {formatted_campaign['campaign_id']}: {e}"
+                    )
+                yield formatted_campaign
+
+    @staticmethod
+    def _format_campaign(platform: str, campaign: Dict) -> Dict:
+        """
+        Формирует унифицированную структуру кампании без объявлений.
 
-                platform_data.append(formatted_campaign)
+        Args:
+            platform: Название платформы
+            campaign: Данные кампании от клиента
 
-            except Exception as e:
-                self.logger.error(
-                    f"Ошибка получения объявлений для кампании {campaign['campaign_id']}: {e}"
-                )
-                # Добавляем кампанию без объявлений
-                formatted_campaign = {
-                    "platform": client.platform_name,
-                    "campaign_id": campaign['campaign_id'],
-                    "name": campaign['name'],
-                    "impressions": campaign['impressions'],
-                    "clicks": campaign['clicks'],
-                    "spend": campaign['spend'],
-                    "ads": []
-                }
-                platform_data.append(formatted_campaign)
-
-        return platform_data
+        Returns:
+            Словарь кампании с пустым списком объявлений
+        """
+        campaign_id, name, impressions, clicks, spend = _campaign_fields(campaign)
+        return {
+            "platform": platform,
+            "campaign_id": campaign_id,
+            "name": name,
+            "impressions": impressions,
+            "clicks": clicks,
+            "spend": spend,
+            "ads": []
+        }
 
     def to_json(self, data: List[Dict], pretty: bool = True) -> str:
         """
         Преобразует агрегированные данные в JSON.
 
+        Принимает и словари aggregate_data, и записи aggregate_records.
+
+        Оставлен для потребителей, которым нужна строка. Для записи
+        в файл или сокет используйте to_json_bytes.
+
         Args:
             data: Агрегированные данные
             pretty: Форматировать ли JSON для читаемости
@@ -139,9 +452,86 @@ class AdsAggregator:
         Returns:
             JSON строка
         """
+        if orjson is not None:
+            return self.to_json_bytes(data, pretty).decode('utf-8')
+
         if pretty:
-            return json.dumps(data, indent=2, ensure_ascii=False)
-        return json.dumps(data, ensure_ascii=False)
+            return json.dumps(data, indent=2, ensure_ascii=False, default=_json_default)
+        return json.dumps(data, ensure_ascii=False, default=_json_default)
+
+    def to_json_bytes(self, data: List[Dict], pretty: bool = True) -> bytes:
+        """
+        Преобразует агрегированные данные в JSON в виде UTF-8 байтов.
+
+        Без промежуточной строки: результат можно сразу писать
+        в файл (f.write(payload)) или отдавать в теле HTTP-ответа.
+
+        Args:
+            data: Агрегированные данные
+            pretty: Форматировать ли JSON для читаемости
+
+        Returns:
+            JSON в кодировке UTF-8
+        """
+        if orjson is not None:
+            # orjson всегда пишет UTF-8 без экранирования не-ASCII,
+            # что эквивалентно ensure_ascii=False
+            option = orjson.OPT_INDENT_2 if pretty else 0
+            return orjson.dumps(data, option=option, default=_json_default)
+
+        return self.to_json(data, pretty).encode('utf-8')
+
+    def stream_json(self, fp: BinaryIO, start_date: date, end_date: date,
+                    ndjson: bool = True) -> int:
+        """
+        Агрегирует данные и сразу пишет их в файл, не собирая весь список.
+
+        Кампании сериализуются по одной по мере получения, объявления
+        запрашиваются не больше чем на две пачки вперед, поэтому сам
+        агрегатор держит ответы не более чем 2 * batch_size кампаний.
+        Ответы fetch_ads_bulk при этом остаются в кэше клиентов
+        (ttl_cache, default_cache) до истечения его срока. Клиенты
+        обрабатываются последовательно.
+
+        Args:
+            fp: Файл или поток, открытый в двоичном режиме
+            start_date: Дата начала периода
+            end_date: Дата окончания периода
+            ndjson: True - по кампании на строку (NDJSON), False - один JSON массив
+
+        Returns:
+            Количество записанных кампаний
+
+        Raises:
+            ValueError: При некорректном диапазоне дат
+        """
+        validate_date_range(start_date, end_date)
+        written = 0
+
+        if not ndjson:
+            fp.write(b'[')
+
+        with dates_validated():
+            for client in self.clients:
+                try:
+                    for campaign in self._iter_client_data(client, start_date, end_date):
+                        if ndjson:
+                            fp.write(_dumps(campaign))
+                            fp.write(b'\n')
+                        else:
+                            if written:
+                                fp.write(b',')
+                            fp.write(_dumps(campaign))
+                        written += 1
+                    self.logger.info(f"Успешно получены данные из {client.platform_name}")
+                except Exception as e:
+                    self.logger.error(f"Ошибка получения данных из {client.platform_name}: {e}")
+                    continue
+
+        if not ndjson:
+            fp.write(b']')
+
+        return written
 
     def get_summary_stats(self, data: List[Dict]) -> Dict:
         """
@@ -153,49 +543,106 @@ class AdsAggregator:
         Returns:
             Словарь со сводной статистикой
         """
-        stats = {
-            "total_platforms": len(set(campaign['platform'] for campaign in data)),
+        if len(data) >= _NUMPY_STATS_THRESHOLD:
+            return self._summary_stats_numpy(data)
+        return self._summary_stats_python(data)
+
+    def _summary_stats_python(self, data: List[Dict]) -> Dict:
+        """Сводная статистика в чистом Python (для небольших объемов данных)."""
+        breakdown = defaultdict(lambda: {
+            "campaigns": 0,
+            "ads": 0,
+            "impressions": 0,
+            "clicks": 0,
+            "spend": 0.0
+        })
+        total_ads = total_impressions = total_clicks = 0
+        total_spend = 0.0
+
+        # Один проход по данным: итоги копятся в локальных переменных
+        for campaign in data:
+            impressions = campaign['impressions']
+            clicks = campaign['clicks']
+            spend = campaign['spend']
+            num_ads = len(campaign['ads'])
+
+            platform_stats = breakdown[campaign['platform']]
+            platform_stats['campaigns'] += 1
+            platform_stats['ads'] += num_ads
+            platform_stats['impressions'] += impressions
+            platform_stats['clicks'] += clicks
+            platform_stats['spend'] += spend
+
+            total_ads += num_ads
+            total_impressions += impressions
+            total_clicks += clicks
+            total_spend += spend
+
+        # Округляем spend
+        for platform_stats in breakdown.values():
+            platform_stats['spend'] = round(platform_stats['spend'], 2)
+
+        return {
+            "total_platforms": len(breakdown),
             "total_campaigns": len(data),
-            "total_ads": sum(len(campaign['ads']) for campaign in data),
-            "platform_breakdown": {},
+            "total_ads": total_ads,
+            "platform_breakdown": dict(breakdown),
             "totals": {
-                "impressions": 0,
-                "clicks": 0,
-                "spend": 0.0
+                "impressions": total_impressions,
+                "clicks": total_clicks,
+                "spend": round(total_spend, 2)
             }
         }
 
-        # Подсчет по платформам
-        for campaign in data:
-            platform = campaign['platform']
-            if platform not in stats['platform_breakdown']:
-                stats['platform_breakdown'][platform] = {
-                    "campaigns": 0,
-                    "ads": 0,
-                    "impressions": 0,
-                    "clicks": 0,
-                    "spend": 0.0
-                }
-
-            stats['platform_breakdown'][platform]['campaigns'] += 1
-            stats['platform_breakdown'][platform]['ads'] += len(campaign['ads'])
-            stats['platform_breakdown'][platform]['impressions'] += campaign['impressions']
-            stats['platform_breakdown'][platform]['clicks'] += campaign['clicks']
-            stats['platform_breakdown'][platform]['spend'] += campaign['spend']
-
-            # Общие итоги
-            stats['totals']['impressions'] += campaign['impressions']
-            stats['totals']['clicks'] += campaign['clicks']
-            stats['totals']['spend'] += campaign['spend']
-
-        # Округляем spend
-        stats['totals']['spend'] = round(stats['totals']['spend'], 2)
-        for platform in stats['platform_breakdown']:
-            stats['platform_breakdown'][platform]['spend'] = round(
-                stats['platform_breakdown'][platform]['spend'], 2
-            )
+    def _summary_stats_numpy(self, data: List[Dict]) -> Dict:
+        """Сводная статистика на NumPy: суммы считаются в C по колонкам."""
+        n = len(data)
+        # Коды платформ раздаются в том же проходе, что и сбор колонок,
+        # в порядке первого появления (как в Python-версии), без сортировки np.unique
+        platform_codes = {}
+        columns = np.fromiter(
+            ((platform_codes.setdefault(c['platform'], len(platform_codes)),
+              c['impressions'], c['clicks'], c['spend'], len(c['ads'])) for c in data),
+            dtype=_STATS_COLUMNS_DTYPE,
+            count=n
+        )
+        codes = columns['code']
+        impressions = columns['impressions']
+        clicks = columns['clicks']
+        spend = columns['spend']
+        num_ads = columns['ads']
+        platforms = list(platform_codes)
+
+        # Суммы по платформам: bincount по кодам платформ
+        k = len(platforms)
+        campaigns_by_platform = np.bincount(codes, minlength=k)
+        ads_by_platform = np.bincount(codes, weights=num_ads, minlength=k)
+        impressions_by_platform = np.bincount(codes, weights=impressions, minlength=k)
+        clicks_by_platform = np.bincount(codes, weights=clicks, minlength=k)
+        spend_by_platform = np.bincount(codes, weights=spend, minlength=k)
+
+        breakdown = {
+            platform: {
+                "campaigns": int(campaigns_by_platform[i]),
+                "ads": int(ads_by_platform[i]),
+                "impressions": int(impressions_by_platform[i]),
+                "clicks": int(clicks_by_platform[i]),
+                "spend": round(float(spend_by_platform[i]), 2)
+            }
+            for i, platform in enumerate(platforms)
+        }
 
-        return stats
+        return {
+            "total_platforms": k,
+            "total_campaigns": n,
+            "total_ads": int(num_ads.sum()),
+            "platform_breakdown": breakdown,
+            "totals": {
+                "impressions": int(impressions.sum()),
+                "clicks": int(clicks.sum()),
+                "spend": round(float(spend.sum()), 2)
+            }
+        }
 
     def filter_by_platform(self, data: List[Dict], platform: str) -> List[Dict]:
         """
@@ -222,3 +669,76 @@ class AdsAggregator:
             Отфильтрованные данные
         """
         return [campaign for campaign in data if campaign['spend'] >= min_spend]
+
+    def build_index(self, data: List[Dict]) -> "DataIndex":
+        """
+        Строит индекс данных для повторных фильтраций.
+
+        Фильтры индекса (DataIndex.filter_by_platform,
+        DataIndex.filter_by_spend_threshold) работают по снимку данных
+        на момент построения; фильтры агрегатора всегда проходят по
+        переданному списку.
+
+        Args:
+            data: Агрегированные данные
+
+        Returns:
+            Индекс данных
+        """
+        return DataIndex(data)
+
+
+class DataIndex:
+    """
+    Индекс агрегированных данных по платформам и расходам.
+
+    Индекс - снимок: добавленные после построения кампании и
+    измененные на месте расходы в нем не учитываются, при изменении
+    данных индекс нужно построить заново.
+    """
+
+    __slots__ = ('data', 'by_platform', 'positions_by_spend', 'spend_sorted')
+
+    def __init__(self, data: List[Dict]):
+        """
+        Args:
+            data: Агрегированные данные (список копируется, кампании - нет)
+        """
+        self.data = list(data)
+        self.by_platform: Dict[str, List[Dict]] = defaultdict(list)
+        for campaign in self.data:
+            self.by_platform[campaign['platform']].append(campaign)
+
+        # Позиции кампаний, отсортированные по расходам, и сами расходы для bisect
+        spends = list(map(_get_spend, self.data))
+        self.positions_by_spend = sorted(range(len(spends)), key=spends.__getitem__)
+        self.spend_sorted = list(map(spends.__getitem__, self.positions_by_spend))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def filter_by_platform(self, platform: str) -> List[Dict]:
+        """
+        Фильтрует кампании по платформе поиском в словаре.
+
+        Args:
+            platform: Название платформы для фильтрации
+
+        Returns:
+            Кампании платформы в исходном порядке
+        """
+        return list(self.by_platform.get(platform, ()))
+
+    def filter_by_spend_threshold(self, min_spend: float) -> List[Dict]:
+        """
+        Фильтрует кампании по минимальному расходу бинарным поиском.
+
+        Args:
+            min_spend: Минимальная сумма расходов
+
+        Returns:
+            Кампании с расходом не меньше min_spend в исходном порядке
+        """
+        start = bisect_left(self.spend_sorted, min_spend)
+        data = self.data
+        return [data[i] for i in sorted(self.positions_by_spend[start:])]
@@ -0,0 +1,119 @@
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date
+from typing import List, Tuple
+
+from .clients.base_client import BaseAdsClient
+
+
+_STOP = object()
+
+
+class AdsBatcher:
+    """
+    Пакетная загрузка объявлений по кампаниям.
+
+    Производители вызывают submit(campaign_id) и получают Future.
+    Фоновый поток забирает из очереди все накопившиеся ID (не больше
+    max_batch_size), при неполной пачке ждет новые не дольше max_wait
+    секунд и выполняет один запрос fetch_ads_bulk на всю пачку.
+    Так N последовательных запросов превращаются в ceil(N / max_batch_size).
+    """
+
+    def __init__(self, client: BaseAdsClient, start_date: date, end_date: date,
+                 max_batch_size: int = 50, max_wait: float = 0.005):
+        """
+        Инициализация батчера.
+
+        Args:
+            client: Клиент рекламной платформы
+            start_date: Дата начала периода
+            end_date: Дата окончания периода
+            max_batch_size: Максимальное количество кампаний в одном запросе
+            max_wait: Максимальное время ожидания заполнения пачки в секундах
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size должен быть положительным")
+
+        self.client = client
+        self.start_date = start_date
+        self.end_date = end_date
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._queue: queue.Queue = queue.Queue()
+        # Фоновый поток работает в контексте создателя батчера (contextvars)
+        self._worker = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._run,),
+            name=f"ads-batcher-{client.platform_name}",
+            daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, campaign_id: str) -> Future:
+        """
+        Ставит кампанию в очередь на загрузку объявлений.
+
+        Args:
+            campaign_id: ID кампании
+
+        Returns:
+            Future со списком объявлений кампании
+        """
+        future = Future()
+        self._queue.put((campaign_id, future))
+        return future
+
+    def close(self) -> None:
+        """Обрабатывает оставшиеся запросы и останавливает фоновый поток."""
+        self._queue.put(_STOP)
+        self._worker.join()
+
+    def __enter__(self) -> "AdsBatcher":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """Цикл фонового потока: собирает пачки и выполняет запросы."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._execute(batch)
+            if stop:
+                return
+
+    def _execute(self, batch: List[Tuple[str, Future]]) -> None:
+        """Выполняет один запрос на пачку и раздает результаты по Future."""
+        campaign_ids = list(dict.fromkeys(campaign_id for campaign_id, _ in batch))
+
+        try:
+            results = self.client.fetch_ads_bulk(campaign_ids, self.start_date, self.end_date)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for campaign_id, future in batch:
+            future.set_result(results.get(campaign_id, []))
@@ -0,0 +1,285 @@
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .exceptions import AuthenticationError, RateLimitError
+
+try:
+    import orjson
+except ImportError:  # orjson опционален, используем stdlib json
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+# Запись кэша: (время сохранения, момент устаревания, момент истечения, значение)
+CacheEntry = Tuple[float, float, float, Any]
+
+# Готовые политики кэширования: ttl - сколько секунд значение свежее,
+# stale - сколько секунд после этого его еще можно отдавать, обновляя в фоне
+CACHE_POLICIES: Dict[str, Dict[str, int]] = {
+    "short": {"ttl": 30, "stale": 120},
+    "normal": {"ttl": 60, "stale": 300},
+    "long": {"ttl": 3600, "stale": 6 * 3600},
+}
+
+
+class MemoryCache:
+    """
+    Потокобезопасный in-memory кэш.
+
+    Истекшие записи не удаляются сразу: они нужны как последние
+    известные данные при ошибках API. Размер ограничен maxsize,
+    при переполнении вытесняются самые старые записи.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Инициализация кэша.
+
+        Args:
+            maxsize: Максимальное количество записей
+        """
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """Возвращает запись кэша или None."""
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key: Hashable, value: Any, ttl: float, stale: float) -> None:
+        """Сохраняет значение в кэш."""
+        now = time.time()
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (now, now + ttl, now + ttl + stale, value)
+            while len(self._data) > self.maxsize:
+                del self._data[next(iter(self._data))]
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache:
+    """
+    Кэш на базе Redis для разделения данных между процессами.
+
+    Хранит (timestamp, stale_at, expires_at, body) в JSON: данные из
+    общего Redis не десериализуются через pickle, поэтому запись в него
+    не дает выполнить код в процессе. Значения должны быть
+    JSON-совместимыми (ответы клиентов - списки и словари).
+    Ключи живут keep секунд, чтобы оставаться доступными для fallback.
+    """
+
+    def __init__(self, client=None, url: str = "redis://localhost:6379/0",
+                 prefix: str = "ads_aggregator:", keep: int = 24 * 3600):
+        """
+        Инициализация Redis кэша.
+
+        Args:
+            client: Готовый клиент redis.Redis (если не передан, создается по url)
+            url: URL подключения к Redis
+            prefix: Префикс ключей
+            keep: Время хранения ключей в секундах
+        """
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError("Для RedisCache необходим пакет redis") from e
+            client = redis.Redis.from_url(url)
+
+        self._client = client
+        self.prefix = prefix
+        self.keep = keep
+
+    def _key(self, key: Hashable) -> str:
+        return self.prefix + repr(key)
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """Возвращает запись кэша или None."""
+        raw = self._client.get(self._key(key))
+        if raw is None:
+            return None
+        timestamp, stale_at, expires_at, value = json.loads(raw) if orjson is None else orjson.loads(raw)
+        return (timestamp, stale_at, expires_at, value)
+
+    def set(self, key: Hashable, value: Any, ttl: float, stale: float) -> None:
+        """Сохраняет значение в кэш."""
+        now = time.time()
+        entry = (now, now + ttl, now + ttl + stale, value)
+        body = orjson.dumps(entry) if orjson is not None else json.dumps(entry, ensure_ascii=False).encode('utf-8')
+        self._client.set(self._key(key), body, ex=max(self.keep, int(ttl + stale)))
+
+    def clear(self) -> None:
+        """Удаляет все ключи с префиксом кэша."""
+        for key in self._client.scan_iter(self.prefix + "*"):
+            self._client.delete(key)
+
+
+default_cache = MemoryCache()
+
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ads-cache-refresh")
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+# Ссылки на фоновые задачи обновления, чтобы их не собрал сборщик мусора
+_background_tasks = set()
+
+
+def _spawn(coro) -> None:
+    """Запускает корутину фоновой задачей в текущем event loop."""
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _key_part(value: Any) -> Hashable:
+    """Приводит аргумент запроса к хешируемому виду."""
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, list):
+        return tuple(value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    return value
+
+
+def _make_key(client, func_name: str, args: tuple, kwargs: dict) -> tuple:
+    """Строит ключ кэша из платформы, аккаунта и аргументов запроса."""
+    parts = [_key_part(a) for a in args]
+    parts.extend((k, _key_part(v)) for k, v in sorted(kwargs.items()))
+    return (client.platform_name, client._get_account_id(), func_name, *parts)
+
+
+def _claim_refresh(key: Hashable) -> bool:
+    """Отмечает ключ как обновляемый; False, если обновление уже идет."""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+        return True
+
+
+def _release_refresh(key: Hashable) -> None:
+    with _refreshing_lock:
+        _refreshing.discard(key)
+
+
+def ttl_cache(ttl: float = 60, stale: float = 300, fallback_on_error: bool = True,
+              cache=None) -> Callable:
+    """
+    Декоратор кэширования методов клиентов рекламных платформ.
+
+    Свежее значение (моложе ttl) возвращается без запроса к API.
+    Устаревшее (в пределах stale после ttl) возвращается сразу,
+    а обновление запускается в фоне. При RateLimitError или
+    AuthenticationError возвращаются последние известные данные,
+    если они есть и fallback_on_error включен.
+
+    Поддерживает и обычные, и асинхронные методы; метод с суффиксом
+    _async использует те же записи кэша, что и синхронный.
+
+    Значения в кэше общие для всех вызывающих (в MemoryCache - те же
+    объекты): AdsAggregator копирует их при сборке результата, прочим
+    вызывающим, изменяющим данные, тоже нужна копия.
+
+    Args:
+        ttl: Время свежести значения в секундах
+        stale: Время, в течение которого устаревшее значение еще отдается
+        fallback_on_error: Возвращать ли последние данные при ошибках API
+        cache: Хранилище (MemoryCache, RedisCache); по умолчанию общий MemoryCache
+
+    Returns:
+        Декоратор метода
+    """
+    def decorator(func: Callable) -> Callable:
+        name = func.__name__.removesuffix('_async')
+
+        def store():
+            return cache if cache is not None else default_cache
+
+        def lookup(key: Hashable, schedule_refresh: Callable[[], None]) -> Optional[CacheEntry]:
+            """Возвращает запись, если ее можно отдать; при устаревании планирует обновление."""
+            entry = store().get(key)
+            if entry is None:
+                return None
+
+            now = time.time()
+            _, stale_at, expires_at, _ = entry
+            if now >= stale_at and now < expires_at and _claim_refresh(key):
+                schedule_refresh()
+            return entry
+
+        def fresh_enough(entry: Optional[CacheEntry]) -> bool:
+            return entry is not None and time.time() < entry[2]
+
+        def fallback(key: Hashable, entry: Optional[CacheEntry], error: Exception) -> Any:
+            if fallback_on_error and entry is not None:
+                logger.warning(f"Ошибка API ({error}), используем данные из кэша для {key}")
+                return entry[3]
+            raise error
+
+        if inspect.iscoroutinefunction(func):
+            async def refresh_async(key, self, args, kwargs):
+                try:
+                    store().set(key, await func(self, *args, **kwargs), ttl, stale)
+                except Exception as e:
+                    logger.warning(f"Не удалось обновить кэш {key}: {e}")
+                finally:
+                    _release_refresh(key)
+
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                key = _make_key(self, name, args, kwargs)
+                entry = lookup(key, lambda: _spawn(refresh_async(key, self, args, kwargs)))
+                if fresh_enough(entry):
+                    return entry[3]
+
+                try:
+                    value = await func(self, *args, **kwargs)
+                except (RateLimitError, AuthenticationError) as e:
+                    return fallback(key, entry, e)
+
+                store().set(key, value, ttl, stale)
+                return value
+
+            return async_wrapper
+
+        def refresh(key, self, args, kwargs):
+            try:
+                store().set(key, func(self, *args, **kwargs), ttl, stale)
+            except Exception as e:
+                logger.warning(f"Не удалось обновить кэш {key}: {e}")
+            finally:
+                _release_refresh(key)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = _make_key(self, name, args, kwargs)
+            entry = lookup(key, lambda: _refresh_executor.submit(refresh, key, self, args, kwargs))
+            if fresh_enough(entry):
+                return entry[3]
+
+            try:
+                value = func(self, *args, **kwargs)
+            except (RateLimitError, AuthenticationError) as e:
+                return fallback(key, entry, e)
+
+            store().set(key, value, ttl, stale)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -1,6 +1,45 @@
+import asyncio
+import contextvars
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Optional
 from datetime import datetime, date
+import numpy as np
+
+
+# Установлен, когда диапазон дат уже проверен вызывающим кодом (агрегатором)
+_dates_validated: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "dates_validated", default=False
+)
+
+
+def validate_date_range(start_date: date, end_date: date) -> None:
+    """
+    Валидирует диапазон дат.
+
+    Raises:
+        ValueError: Если start_date больше end_date или находится в будущем
+    """
+    if start_date > end_date:
+        raise ValueError("start_date не может быть больше end_date")
+
+    if start_date > date.today():
+        raise ValueError("start_date не может быть в будущем")
+
+
+@contextmanager
+def dates_validated() -> Iterator[None]:
+    """
+    Отключает повторную проверку дат в методах клиентов внутри блока.
+
+    Флаг хранится в contextvars, поэтому наследуется задачами asyncio
+    и потоками, запущенными через contextvars.copy_context().run.
+    """
+    token = _dates_validated.set(True)
+    try:
+        yield
+    finally:
+        _dates_validated.reset(token)
 
 
 class BaseAdsClient(ABC):
@@ -25,6 +64,10 @@ class BaseAdsClient(ABC):
         """Возвращает название платформы."""
         pass
 
+    def _get_account_id(self) -> Optional[str]:
+        """Возвращает ID рекламного аккаунта (используется в ключах кэша)."""
+        return None
+
     @abstractmethod
     def fetch_campaigns(self, start_date: date, end_date: date) -> List[Dict]:
         """
@@ -60,6 +103,58 @@ class BaseAdsClient(ABC):
         """
         pass
 
+    def fetch_ads_bulk(self, campaign_ids: List[str], start_date: date,
+                       end_date: date) -> Dict[str, List[Dict]]:
+        """
+        Получает объявления сразу для нескольких кампаний.
+
+        Реализация по умолчанию вызывает fetch_ads для каждой кампании.
+        Клиенты, API которых умеет фильтровать по списку кампаний,
+        переопределяют метод, чтобы выполнить один запрос вместо N.
+
+        Args:
+            campaign_ids: Список ID кампаний
+            start_date: Дата начала периода
+            end_date: Дата окончания периода
+
+        Returns:
+            Словарь {campaign_id: список объявлений}
+
+        Raises:
+            AdsAPIError: При ошибке запроса к API
+        """
+        return {
+            campaign_id: self.fetch_ads(campaign_id, start_date, end_date)
+            for campaign_id in campaign_ids
+        }
+
+    async def fetch_campaigns_async(self, start_date: date, end_date: date) -> List[Dict]:
+        """
+        Асинхронная версия fetch_campaigns.
+
+        По умолчанию выполняет синхронный метод через asyncio.to_thread.
+        Клиенты с нативным асинхронным API переопределяют метод.
+        """
+        return await asyncio.to_thread(self.fetch_campaigns, start_date, end_date)
+
+    async def fetch_ads_async(self, campaign_id: str, start_date: date,
+                              end_date: date) -> List[Dict]:
+        """
+        Асинхронная версия fetch_ads.
+
+        По умолчанию выполняет синхронный метод через asyncio.to_thread.
+        """
+        return await asyncio.to_thread(self.fetch_ads, campaign_id, start_date, end_date)
+
+    async def fetch_ads_bulk_async(self, campaign_ids: List[str], start_date: date,
+                                   end_date: date) -> Dict[str, List[Dict]]:
+        """
+        Асинхронная версия fetch_ads_bulk.
+
+        По умолчанию выполняет синхронный метод через asyncio.to_thread.
+        """
+        return await asyncio.to_thread(self.fetch_ads_bulk, campaign_ids, start_date, end_date)
+
     def _calculate_ctr(self, impressions: int, clicks: int) -> float:
         """Вычисляет CTR (Click Through Rate)."""
         if impressions == 0:
@@ -72,10 +167,19 @@ class BaseAdsClient(ABC):
             return 0.0
         return round(spend / clicks, 2)
 
-    def _validate_date_range(self, start_date: date, end_date: date) -> None:
-        """Валидирует диапазон дат."""
-        if start_date > end_date:
-            raise ValueError("start_date не может быть больше end_date")
+    def _calculate_ctr_vec(self, impressions: np.ndarray, clicks: np.ndarray) -> np.ndarray:
+        """Вычисляет CTR для массивов показов и кликов (0 при нуле показов)."""
+        impressions = np.asarray(impressions, dtype=np.float64)
+        ctr = np.divide(clicks, impressions, out=np.zeros_like(impressions), where=impressions > 0)
+        return np.round(ctr * 100, 2)
 
-        if start_date > date.today():
-            raise ValueError("start_date не может быть в будущем")
+    def _calculate_cpc_vec(self, spend: np.ndarray, clicks: np.ndarray) -> np.ndarray:
+        """Вычисляет CPC для массивов расходов и кликов (0 при нуле кликов)."""
+        clicks = np.asarray(clicks, dtype=np.float64)
+        cpc = np.divide(spend, clicks, out=np.zeros_like(clicks), where=clicks > 0)
+        return np.round(cpc, 2)
+
+    def _validate_date_range(self, start_date: date, end_date: date) -> None:
+        """Валидирует диапазон дат, если он еще не проверен вызывающим кодом."""
+        if not _dates_validated.get():
+            validate_date_range(start_date, end_date)
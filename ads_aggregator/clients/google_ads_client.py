@@ -1,11 +1,32 @@
+import asyncio
 import time
-import random
 from typing import List, Dict, Optional
 from datetime import datetime, date
+import numpy as np
 from .base_client import BaseAdsClient
+from ..cache import ttl_cache
+from ..retry import retry
 from ..exceptions import AuthenticationError, RateLimitError, DataNotFoundError, InvalidTokenError
 
 
+# Шаблоны GAQL запросов: при вызове подставляются только даты и ID кампаний
+_CAMPAIGNS_QUERY = (
+    "SELECT campaign.id, campaign.name, metrics.impressions, metrics.clicks, metrics.cost_micros "
+    "FROM campaign "
+    "WHERE segments.date BETWEEN '%s' AND '%s' "
+    "ORDER BY campaign.id"
+)
+
+_ADS_QUERY = (
+    "SELECT ad_group_ad.ad.id, ad_group_ad.ad.name, metrics.impressions, metrics.clicks, "
+    "metrics.cost_micros "
+    "FROM ad_group_ad "
+    "WHERE campaign.id IN (%s) "
+    "AND segments.date BETWEEN '%s' AND '%s' "
+    "ORDER BY ad_group_ad.ad.id"
+)
+
+
 class GoogleAdsClient(BaseAdsClient):
     """
     Клиент для работы с Google Ads API.
@@ -40,9 +61,17 @@ class GoogleAdsClient(BaseAdsClient):
         if not all(required_fields):
             raise InvalidTokenError("Отсутствуют обязательные параметры для Google Ads API")
 
+        # Генератор мок данных: массивы значений вместо поштучных вызовов random
+        self._rng = np.random.default_rng()
+
     def _get_platform_name(self) -> str:
         return "google"
 
+    def _get_account_id(self) -> Optional[str]:
+        return self.customer_id
+
+    @ttl_cache(ttl=60, stale=300)
+    @retry()
     def fetch_campaigns(self, start_date: date, end_date: date) -> List[Dict]:
         """
         Получает кампании из Google Ads API.
@@ -67,38 +96,20 @@ class GoogleAdsClient(BaseAdsClient):
 
         try:
             # Имитируем возможные ошибки API
-            if random.random() < 0.1:  # 10% вероятность ошибки токена
-                raise AuthenticationError("Неверный developer token Google Ads")
-
-            if random.random() < 0.05:  # 5% вероятность quota exceeded
-                raise RateLimitError("Превышена квота запросов Google Ads API")
+            self._simulate_campaigns_errors()
 
             # Симуляция задержки API
             time.sleep(0.1)
 
-            # Мок данные кампаний
-            campaigns = []
-            for i in range(4):  # 4 кампании для примера
-                # Google Ads возвращает cost в микро-долларах (умножить на 1,000,000)
-                cost_micros = random.randint(50000000, 500000000)  # 50-500 долларов
-                spend = cost_micros / 1000000  # Конвертируем в доллары
-
-                campaign = {
-                    "campaign_id": f"google_campaign_{i+1}",
-                    "name": f"Google Campaign {i+1}",
-                    "impressions": random.randint(1500, 12000),
-                    "clicks": random.randint(75, 600),
-                    "spend": round(spend, 2)
-                }
-                campaigns.append(campaign)
-
-            return campaigns
+            return self._mock_campaigns()
 
         except Exception as e:
             if isinstance(e, (AuthenticationError, RateLimitError)):
                 raise
             raise DataNotFoundError(f"Ошибка получения кампаний Google: {str(e)}")
 
+    @ttl_cache(ttl=60, stale=300)
+    @retry()
     def fetch_ads(self, campaign_id: str, start_date: date, end_date: date) -> List[Dict]:
         """
         Получает объявления для кампании из Google Ads API.
@@ -122,75 +133,210 @@ class GoogleAdsClient(BaseAdsClient):
 
         try:
             # Имитация ошибок API
-            if random.random() < 0.1:
-                raise AuthenticationError("Refresh token истек")
+            self._simulate_ads_errors()
 
             # Симуляция задержки API
             time.sleep(0.1)
 
-            # Мок данные объявлений
-            ads = []
-            num_ads = random.randint(2, 6)  # 2-6 объявлений на кампанию
-
-            for i in range(num_ads):
-                impressions = random.randint(400, 4000)
-                clicks = random.randint(15, impressions // 8)
-                cost_micros = random.randint(10000000, 100000000)  # 10-100 долларов
-                spend = round(cost_micros / 1000000, 2)
-
-                ad = {
-                    "ad_id": f"{campaign_id}_ad_{i+1}",
-                    "ad_name": f"Google Ad {i+1}",
-                    "impressions": impressions,
-                    "clicks": clicks,
-                    "spend": spend,
-                    "ctr": self._calculate_ctr(impressions, clicks),
-                    "cpc": self._calculate_cpc(spend, clicks)
-                }
-                ads.append(ad)
-
-            return ads
+            return self._mock_ads(campaign_id)
+
+        except Exception as e:
+            if isinstance(e, (AuthenticationError, RateLimitError)):
+                raise
+            raise DataNotFoundError(f"Ошибка получения объявлений Google: {str(e)}")
+
+    @ttl_cache(ttl=60, stale=300)
+    @retry()
+    def fetch_ads_bulk(self, campaign_ids: List[str], start_date: date,
+                       end_date: date) -> Dict[str, List[Dict]]:
+        """
+        Получает объявления для нескольких кампаний одним запросом.
+
+        В реальной реализации GAQL запрос с фильтром
+        WHERE campaign.id IN (...), см. _build_gaql_query.
+
+        Args:
+            campaign_ids: Список ID кампаний
+            start_date: Дата начала
+            end_date: Дата окончания
+
+        Returns:
+            Словарь {campaign_id: список объявлений}
+        """
+        self._validate_date_range(start_date, end_date)
+
+        try:
+            # Имитация ошибок API
+            self._simulate_ads_errors()
+
+            # Симуляция задержки API: один запрос на всю пачку
+            time.sleep(0.1)
+
+            return {campaign_id: self._mock_ads(campaign_id) for campaign_id in campaign_ids}
 
         except Exception as e:
-            if isinstance(e, AuthenticationError):
+            if isinstance(e, (AuthenticationError, RateLimitError)):
                 raise
             raise DataNotFoundError(f"Ошибка получения объявлений Google: {str(e)}")
 
+    @ttl_cache(ttl=60, stale=300)
+    @retry()
+    async def fetch_campaigns_async(self, start_date: date, end_date: date) -> List[Dict]:
+        """
+        Асинхронно получает кампании из Google Ads API.
+
+        В реальной реализации тот же GAQL запрос отправляется
+        через aiohttp.ClientSession в REST-метод googleAds:search.
+
+        Args:
+            start_date: Дата начала
+            end_date: Дата окончания
+
+        Returns:
+            Список кампаний с метриками
+        """
+        self._validate_date_range(start_date, end_date)
+
+        try:
+            self._simulate_campaigns_errors()
+
+            # Симуляция задержки API без блокировки event loop
+            await asyncio.sleep(0.1)
+
+            return self._mock_campaigns()
+
+        except Exception as e:
+            if isinstance(e, (AuthenticationError, RateLimitError)):
+                raise
+            raise DataNotFoundError(f"Ошибка получения кампаний Google: {str(e)}")
+
+    async def fetch_ads_async(self, campaign_id: str, start_date: date,
+                              end_date: date) -> List[Dict]:
+        """
+        Асинхронно получает объявления для кампании из Google Ads API.
+
+        Кэш и повторы обеспечивает fetch_ads_bulk_async: ответ хранится
+        в кэше один раз, под ключом пачки из одной кампании.
+
+        Args:
+            campaign_id: ID кампании
+            start_date: Дата начала
+            end_date: Дата окончания
+
+        Returns:
+            Список объявлений с метриками и рассчитанными CTR/CPC
+        """
+        return (await self.fetch_ads_bulk_async([campaign_id], start_date, end_date))[campaign_id]
+
+    @ttl_cache(ttl=60, stale=300)
+    @retry()
+    async def fetch_ads_bulk_async(self, campaign_ids: List[str], start_date: date,
+                                   end_date: date) -> Dict[str, List[Dict]]:
+        """
+        Асинхронно получает объявления для нескольких кампаний одним запросом.
+
+        Args:
+            campaign_ids: Список ID кампаний
+            start_date: Дата начала
+            end_date: Дата окончания
+
+        Returns:
+            Словарь {campaign_id: список объявлений}
+        """
+        self._validate_date_range(start_date, end_date)
+
+        try:
+            self._simulate_ads_errors()
+
+            # Симуляция задержки API без блокировки event loop
+            await asyncio.sleep(0.1)
+
+            return {campaign_id: self._mock_ads(campaign_id) for campaign_id in campaign_ids}
+
+        except Exception as e:
+            if isinstance(e, (AuthenticationError, RateLimitError)):
+                raise
+            raise DataNotFoundError(f"Ошибка получения объявлений Google: {str(e)}")
+
+    def _simulate_campaigns_errors(self) -> None:
+        """Имитирует возможные ошибки API при запросе кампаний."""
+        roll = self._rng.random()
+        if roll < 0.1:  # 10% вероятность ошибки токена
+            raise AuthenticationError("Неверный developer token Google Ads")
+
+        if roll < 0.145:  # еще 4.5% (5% от оставшихся) - quota exceeded
+            raise RateLimitError("Превышена квота запросов Google Ads API")
+
+    def _simulate_ads_errors(self) -> None:
+        """Имитирует возможные ошибки API при запросе объявлений."""
+        if self._rng.random() < 0.1:
+            raise AuthenticationError("Refresh token истек")
+
+    def _mock_campaigns(self) -> List[Dict]:
+        """Генерирует мок данные кампаний."""
+        n = 4  # 4 кампании для примера
+        # Google Ads возвращает cost в микро-долларах (умножить на 1,000,000)
+        cost_micros = self._rng.integers(50_000_000, 500_000_001, size=n)  # 50-500 долларов
+        spends = np.round(cost_micros / 1_000_000, 2).tolist()  # Конвертируем в доллары
+        impressions = self._rng.integers(1500, 12001, size=n).tolist()
+        clicks = self._rng.integers(75, 601, size=n).tolist()
+
+        return [
+            {
+                "campaign_id": f"google_campaign_{i+1}",
+                "name": f"Google Campaign {i+1}",
+                "impressions": impressions[i],
+                "clicks": clicks[i],
+                "spend": spends[i]
+            }
+            for i in range(n)
+        ]
+
+    def _mock_ads(self, campaign_id: str) -> List[Dict]:
+        """Генерирует мок данные объявлений для кампании."""
+        num_ads = int(self._rng.integers(2, 7))  # 2-6 объявлений на кампанию
+
+        imps = self._rng.integers(400, 4001, size=num_ads)
+        clicks = self._rng.integers(15, imps // 8 + 1)
+        costs = self._rng.integers(10_000_000, 100_000_001, size=num_ads)  # 10-100 долларов
+        spends = np.round(costs / 1_000_000, 2)
+
+        ctrs = self._calculate_ctr_vec(imps, clicks)
+        cpcs = self._calculate_cpc_vec(spends, clicks)
+
+        return [
+            {
+                "ad_id": f"{campaign_id}_ad_{i+1}",
+                "ad_name": f"Google Ad {i+1}",
+                "impressions": impressions,
+                "clicks": ad_clicks,
+                "spend": spend,
+                "ctr": ctr,
+                "cpc": cpc
+            }
+            for i, (impressions, ad_clicks, spend, ctr, cpc)
+            in enumerate(zip(imps.tolist(), clicks.tolist(), spends.tolist(),
+                             ctrs.tolist(), cpcs.tolist()))
+        ]
+
     def _build_gaql_query(self, query_type: str, **kwargs) -> str:
         """
         Строит GAQL запрос для Google Ads API.
 
         Args:
             query_type: Тип запроса ('campaigns' или 'ads')
-            **kwargs: Дополнительные параметры
+            **kwargs: Дополнительные параметры (start_date, end_date,
+                campaign_id или campaign_ids для запроса объявлений)
 
         Returns:
             GAQL запрос как строка
         """
         if query_type == "campaigns":
-            return f"""
-                SELECT 
-                    campaign.id,
-                    campaign.name,
-                    metrics.impressions,
-                    metrics.clicks,
-                    metrics.cost_micros
-                FROM campaign 
-                WHERE segments.date BETWEEN '{kwargs.get('start_date')}' AND '{kwargs.get('end_date')}'
-                ORDER BY campaign.id
-            """
+            return _CAMPAIGNS_QUERY % (kwargs.get('start_date'), kwargs.get('end_date'))
         elif query_type == "ads":
-            return f"""
-                SELECT 
-                    ad_group_ad.ad.id,
-                    ad_group_ad.ad.name,
-                    metrics.impressions,
-                    metrics.clicks,
-                    metrics.cost_micros
-                FROM ad_group_ad 
-                WHERE campaign.id = {kwargs.get('campaign_id')}
-                AND segments.date BETWEEN '{kwargs.get('start_date')}' AND '{kwargs.get('end_date')}'
-                ORDER BY ad_group_ad.ad.id
-            """
+            campaign_ids = kwargs.get('campaign_ids') or [kwargs.get('campaign_id')]
+            return _ADS_QUERY % (
+                ', '.join(map(str, campaign_ids)), kwargs.get('start_date'), kwargs.get('end_date')
+            )
         else:
             raise ValueError(f"Неизвестный тип запроса: {query_type}")
@@ -1,8 +1,11 @@
+import asyncio
 import time
-import random
 from typing import List, Dict, Optional
 from datetime import datetime, date
+import numpy as np
 from .base_client import BaseAdsClient
+from ..cache import ttl_cache
+from ..retry import retry
 from ..exceptions import AuthenticationError, RateLimitError, DataNotFoundError, InvalidTokenError
 
 
@@ -34,9 +37,17 @@ class MetaAdsClient(BaseAdsClient):
         if not all([self.access_token, self.app_id, self.app_secret, self.account_id]):
             raise InvalidTokenError("Отсутствуют обязательные параметры для Meta Ads API")
 
+        # Генератор мок данных: массивы значений вместо поштучных вызовов random
+        self._rng = np.random.default_rng()
+
     def _get_platform_name(self) -> str:
         return "meta"
 
+    def _get_account_id(self) -> Optional[str]:
+        return self.account_id
+
+    @ttl_cache(ttl=60, stale=300)
+    @retry()
     def fetch_campaigns(self, start_date: date, end_date: date) -> List[Dict]:
         """
         Получает кампании из Meta Ads API.
@@ -55,34 +66,20 @@ class MetaAdsClient(BaseAdsClient):
 
         try:
             # Имитируем API запрос с возможными ошибками
-            if random.random() < 0.1:  # 10% вероятность ошибки аутентификации
-                raise AuthenticationError("Неверный токен доступа Meta API")
-
-            if random.random() < 0.05:  # 5% вероятность rate limit
-                raise RateLimitError("Превышен лимит запросов Meta API")
+            self._simulate_campaigns_errors()
 
             # Симуляция задержки API
             time.sleep(0.1)
 
-            # Мок данные для демонстрации структуры
-            campaigns = []
-            for i in range(3):  # 3 кампании для примера
-                campaign = {
-                    "campaign_id": f"meta_campaign_{i+1}",
-                    "name": f"Meta Campaign {i+1}",
-                    "impressions": random.randint(1000, 10000),
-                    "clicks": random.randint(50, 500),
-                    "spend": round(random.uniform(20.0, 200.0), 2)
-                }
-                campaigns.append(campaign)
-
-            return campaigns
+            return self._mock_campaigns()
 
         except Exception as e:
             if isinstance(e, (AuthenticationError, RateLimitError)):
                 raise
             raise DataNotFoundError(f"Ошибка получения кампаний Meta: {str(e)}")
 
+    @ttl_cache(ttl=60, stale=300)
+    @retry()
     def fetch_ads(self, campaign_id: str, start_date: date, end_date: date) -> List[Dict]:
         """
         Получает объявления для кампании из Meta Ads API.
@@ -103,39 +100,193 @@ class MetaAdsClient(BaseAdsClient):
 
         try:
             # Имитация ошибок API
-            if random.random() < 0.1:
-                raise AuthenticationError("Токен истек")
+            self._simulate_ads_errors()
 
             # Симуляция задержки API
             time.sleep(0.1)
 
-            # Мок данные объявлений для кампании
-            ads = []
-            num_ads = random.randint(2, 5)  # 2-5 объявлений на кампанию
+            return self._mock_ads(campaign_id)
+
+        except Exception as e:
+            if isinstance(e, (AuthenticationError, RateLimitError)):
+                raise
+            raise DataNotFoundError(f"Ошибка получения объявлений Meta: {str(e)}")
+
+    @ttl_cache(ttl=60, stale=300)
+    @retry()
+    def fetch_ads_bulk(self, campaign_ids: List[str], start_date: date,
+                       end_date: date) -> Dict[str, List[Dict]]:
+        """
+        Получает объявления для нескольких кампаний одним запросом.
+
+        В реальной реализации запрос к insights аккаунта на уровне объявлений:
+        AdAccount(account_id).get_insights(params={
+            'level': 'ad',
+            'filtering': [{'field': 'campaign.id', 'operator': 'IN', 'value': campaign_ids}],
+            'time_range': {'since': start_date, 'until': end_date},
+        })
 
-            for i in range(num_ads):
-                impressions = random.randint(300, 3000)
-                clicks = random.randint(10, impressions // 10)
-                spend = round(random.uniform(5.0, 50.0), 2)
+        Args:
+            campaign_ids: Список ID кампаний
+            start_date: Дата начала
+            end_date: Дата окончания
 
-                ad = {
-                    "ad_id": f"{campaign_id}_ad_{i+1}",
-                    "ad_name": f"Meta Creative {i+1}",
-                    "impressions": impressions,
-                    "clicks": clicks,
-                    "spend": spend,
-                    "ctr": self._calculate_ctr(impressions, clicks),
-                    "cpc": self._calculate_cpc(spend, clicks)
-                }
-                ads.append(ad)
+        Returns:
+            Словарь {campaign_id: список объявлений}
+        """
+        self._validate_date_range(start_date, end_date)
 
-            return ads
+        try:
+            # Имитация ошибок API
+            self._simulate_ads_errors()
+
+            # Симуляция задержки API: один запрос на всю пачку
+            time.sleep(0.1)
+
+            return {campaign_id: self._mock_ads(campaign_id) for campaign_id in campaign_ids}
 
         except Exception as e:
-            if isinstance(e, AuthenticationError):
+            if isinstance(e, (AuthenticationError, RateLimitError)):
                 raise
             raise DataNotFoundError(f"Ошибка получения объявлений Meta: {str(e)}")
 
+    @ttl_cache(ttl=60, stale=300)
+    @retry()
+    async def fetch_campaigns_async(self, start_date: date, end_date: date) -> List[Dict]:
+        """
+        Асинхронно получает кампании из Meta Ads API.
+
+        В реальной реализации запрос к Graph API
+        (GET /{account_id}/campaigns) через aiohttp.ClientSession.
+
+        Args:
+            start_date: Дата начала
+            end_date: Дата окончания
+
+        Returns:
+            Список кампаний с метриками
+        """
+        self._validate_date_range(start_date, end_date)
+
+        try:
+            self._simulate_campaigns_errors()
+
+            # Симуляция задержки API без блокировки event loop
+            await asyncio.sleep(0.1)
+
+            return self._mock_campaigns()
+
+        except Exception as e:
+            if isinstance(e, (AuthenticationError, RateLimitError)):
+                raise
+            raise DataNotFoundError(f"Ошибка получения кампаний Meta: {str(e)}")
+
+    async def fetch_ads_async(self, campaign_id: str, start_date: date,
+                              end_date: date) -> List[Dict]:
+        """
+        Асинхронно получает объявления для кампании из Meta Ads API.
+
+        Кэш и повторы обеспечивает fetch_ads_bulk_async: ответ хранится
+        в кэше один раз, под ключом пачки из одной кампании.
+
+        Args:
+            campaign_id: ID кампании
+            start_date: Дата начала
+            end_date: Дата окончания
+
+        Returns:
+            Список объявлений с метриками и рассчитанными CTR/CPC
+        """
+        return (await self.fetch_ads_bulk_async([campaign_id], start_date, end_date))[campaign_id]
+
+    @ttl_cache(ttl=60, stale=300)
+    @retry()
+    async def fetch_ads_bulk_async(self, campaign_ids: List[str], start_date: date,
+                                   end_date: date) -> Dict[str, List[Dict]]:
+        """
+        Асинхронно получает объявления для нескольких кампаний одним запросом.
+
+        Args:
+            campaign_ids: Список ID кампаний
+            start_date: Дата начала
+            end_date: Дата окончания
+
+        Returns:
+            Словарь {campaign_id: список объявлений}
+        """
+        self._validate_date_range(start_date, end_date)
+
+        try:
+            self._simulate_ads_errors()
+
+            # Симуляция задержки API без блокировки event loop
+            await asyncio.sleep(0.1)
+
+            return {campaign_id: self._mock_ads(campaign_id) for campaign_id in campaign_ids}
+
+        except Exception as e:
+            if isinstance(e, (AuthenticationError, RateLimitError)):
+                raise
+            raise DataNotFoundError(f"Ошибка получения объявлений Meta: {str(e)}")
+
+    def _simulate_campaigns_errors(self) -> None:
+        """Имитирует возможные ошибки API при запросе кампаний."""
+        roll = self._rng.random()
+        if roll < 0.1:  # 10% вероятность ошибки аутентификации
+            raise AuthenticationError("Неверный токен доступа Meta API")
+
+        if roll < 0.145:  # еще 4.5% (5% от оставшихся) - rate limit
+            raise RateLimitError("Превышен лимит запросов Meta API")
+
+    def _simulate_ads_errors(self) -> None:
+        """Имитирует возможные ошибки API при запросе объявлений."""
+        if self._rng.random() < 0.1:
+            raise AuthenticationError("Токен истек")
+
+    def _mock_campaigns(self) -> List[Dict]:
+        """Генерирует мок данные кампаний."""
+        n = 3  # 3 кампании для примера
+        impressions = self._rng.integers(1000, 10001, size=n).tolist()
+        clicks = self._rng.integers(50, 501, size=n).tolist()
+        spends = np.round(self._rng.uniform(20.0, 200.0, size=n), 2).tolist()
+
+        return [
+            {
+                "campaign_id": f"meta_campaign_{i+1}",
+                "name": f"Meta Campaign {i+1}",
+                "impressions": impressions[i],
+                "clicks": clicks[i],
+                "spend": spends[i]
+            }
+            for i in range(n)
+        ]
+
+    def _mock_ads(self, campaign_id: str) -> List[Dict]:
+        """Генерирует мок данные объявлений для кампании."""
+        num_ads = int(self._rng.integers(2, 6))  # 2-5 объявлений на кампанию
+
+        imps = self._rng.integers(300, 3001, size=num_ads)
+        clicks = self._rng.integers(10, imps // 10 + 1)
+        spends = np.round(self._rng.uniform(5.0, 50.0, size=num_ads), 2)
+
+        ctrs = self._calculate_ctr_vec(imps, clicks)
+        cpcs = self._calculate_cpc_vec(spends, clicks)
+
+        return [
+            {
+                "ad_id": f"{campaign_id}_ad_{i+1}",
+                "ad_name": f"Meta Creative {i+1}",
+                "impressions": impressions,
+                "clicks": ad_clicks,
+                "spend": spend,
+                "ctr": ctr,
+                "cpc": cpc
+            }
+            for i, (impressions, ad_clicks, spend, ctr, cpc)
+            in enumerate(zip(imps.tolist(), clicks.tolist(), spends.tolist(),
+                             ctrs.tolist(), cpcs.tolist()))
+        ]
+
     def _authenticate(self) -> bool:
         """
         Проверка аутентификации.
@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 class AdsAPIError(Exception):
     """Базовое исключение для ошибок API."""
     pass
@@ -9,8 +12,17 @@ class AuthenticationError(AdsAPIError):
 
 
 class RateLimitError(AdsAPIError):
-    """Ошибка превышения лимита запросов."""
-    pass
+    """
+    Ошибка превышения лимита запросов.
+
+    Attributes:
+        retry_after: Рекомендованная платформой пауза в секундах
+            (заголовок Retry-After), если известна
+    """
+
+    def __init__(self, message: str = "", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 class DataNotFoundError(AdsAPIError):
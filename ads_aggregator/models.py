@@ -0,0 +1,119 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterator, List
+
+
+@dataclass(slots=True)
+class Ad:
+    """
+    Объявление в унифицированном формате.
+
+    Компактная альтернатива словарю: без __dict__ и хеширования
+    ключей при доступе к полям.
+    """
+
+    ad_id: str
+    ad_name: str
+    impressions: int
+    clicks: int
+    spend: float
+    ctr: float
+    cpc: float
+
+    @classmethod
+    def from_dict(cls, ad: Dict) -> "Ad":
+        """Создает объявление из словаря клиента платформы."""
+        return cls(ad['ad_id'], ad['ad_name'], ad['impressions'], ad['clicks'],
+                   ad['spend'], ad['ctr'], ad['cpc'])
+
+    def to_dict(self) -> Dict:
+        """Возвращает объявление в виде словаря."""
+        return {
+            "ad_id": self.ad_id,
+            "ad_name": self.ad_name,
+            "impressions": self.impressions,
+            "clicks": self.clicks,
+            "spend": self.spend,
+            "ctr": self.ctr,
+            "cpc": self.cpc
+        }
+
+
+@dataclass(slots=True)
+class Campaign:
+    """Кампания с объявлениями в унифицированном формате."""
+
+    platform: str
+    campaign_id: str
+    name: str
+    impressions: int
+    clicks: int
+    spend: float
+    ads: List[Ad] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, campaign: Dict) -> "Campaign":
+        """Создает кампанию из словаря, возвращаемого AdsAggregator."""
+        return cls(
+            campaign['platform'],
+            campaign['campaign_id'],
+            campaign['name'],
+            campaign['impressions'],
+            campaign['clicks'],
+            campaign['spend'],
+            [Ad.from_dict(ad) for ad in campaign['ads']]
+        )
+
+    def to_dict(self) -> Dict:
+        """Возвращает кампанию в виде словаря (формат aggregate_data)."""
+        return {
+            "platform": self.platform,
+            "campaign_id": self.campaign_id,
+            "name": self.name,
+            "impressions": self.impressions,
+            "clicks": self.clicks,
+            "spend": self.spend,
+            "ads": [ad.to_dict() for ad in self.ads]
+        }
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Creative(Mapping):
+    """
+    Креатив в ротации (неизменяемый).
+
+    Ротатор отдает один и тот же экземпляр всем вызывающим без
+    защитных копий. Поддерживает доступ как к словарю
+    (creative['ctr'], dict(creative)) для совместимости с кодом,
+    работавшим со словарями; сравнение тоже как у Mapping.
+    """
+
+    ad_id: str
+    ad_name: str
+    impressions: int
+    clicks: int
+    spend: float
+    ctr: float
+    cpc: float
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _CREATIVE_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_CREATIVE_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_CREATIVE_FIELDS)
+
+    def __hash__(self) -> int:
+        return hash((self.ad_id, self.ad_name, self.impressions, self.clicks,
+                     self.spend, self.ctr, self.cpc))
+
+    def to_dict(self) -> Dict:
+        """Возвращает креатив в виде словаря."""
+        return dict(self)
+
+
+_CREATIVE_FIELDS = tuple(f.name for f in fields(Creative))
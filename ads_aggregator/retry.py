@@ -0,0 +1,108 @@
+import asyncio
+import functools
+import inspect
+import logging
+import random
+import time
+from typing import Callable, Optional, Tuple, Type
+
+from .exceptions import RateLimitError
+
+
+logger = logging.getLogger(__name__)
+
+
+def _delay(error: Exception, attempt: int, base_delay: float, max_delay: float,
+           jitter: bool) -> Optional[float]:
+    """
+    Вычисляет паузу перед следующей попыткой.
+
+    Если платформа сообщила Retry-After, используется он, иначе
+    экспоненциальная задержка base_delay * 2^attempt, не больше
+    max_delay. Retry-After больше max_delay не сокращается: повтор
+    раньше срока снова упрется в лимит, поэтому возвращается None.
+    """
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after is not None:
+        return retry_after if retry_after <= max_delay else None
+
+    delay = min(base_delay * 2 ** attempt, max_delay)
+    if jitter:
+        # Разносим повторы параллельных запросов во времени
+        delay *= random.uniform(0.5, 1.0)
+    return delay
+
+
+def retry(exceptions: Tuple[Type[Exception], ...] = (RateLimitError,), tries: int = 3,
+          base_delay: float = 0.5, max_delay: float = 5.0, jitter: bool = True) -> Callable:
+    """
+    Декоратор повторных попыток с экспоненциальной задержкой.
+
+    Повторяет вызов при исключениях из exceptions, после последней
+    попытки или если Retry-After больше max_delay логирует и
+    пробрасывает ошибку. Поддерживает обычные и
+    асинхронные функции. В сочетании с ttl_cache декоратор кэша
+    ставится снаружи, чтобы после исчерпания попыток вернуть
+    последние известные данные.
+
+    Args:
+        exceptions: Исключения, при которых вызов повторяется
+        tries: Общее количество попыток
+        base_delay: Задержка перед первым повтором в секундах
+        max_delay: Максимальная задержка в секундах
+        jitter: Добавлять ли случайный разброс к задержке
+
+    Returns:
+        Декоратор функции
+    """
+    if tries < 1:
+        raise ValueError("tries должен быть положительным")
+
+    def decorator(func: Callable) -> Callable:
+        def next_delay(error: Exception, attempt: int) -> Optional[float]:
+            """Пауза перед повтором или None, если ошибку нужно пробросить."""
+            if attempt == tries - 1:
+                logger.error(f"{func.__qualname__}: попытки исчерпаны ({tries}): {error}")
+                return None
+
+            delay = _delay(error, attempt, base_delay, max_delay, jitter)
+            if delay is None:
+                logger.error(
+                    f"{func.__qualname__}: Retry-After {error.retry_after} с больше "
+                    f"max_delay {max_delay} с: {error}"
+                )
+                return None
+
+            logger.warning(
+                f"{func.__qualname__}: {error}, повтор {attempt + 1}/{tries - 1} через {delay:.2f} с"
+            )
+            return delay
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(tries):
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions as e:
+                        delay = next_delay(e, attempt)
+                        if delay is None:
+                            raise
+                        await asyncio.sleep(delay)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(tries):
+                try:
+                    return func(*args, **kwargs)
+                except exceptions as e:
+                    delay = next_delay(e, attempt)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+
+        return wrapper
+
+    return decorator
@@ -1,6 +1,143 @@
-from typing import List, Dict, Optional
+from collections.abc import KeysView, Sequence
+from typing import Any, Callable, ClassVar, List, Dict, Iterator, Mapping, Optional, Tuple, Union
 from enum import Enum
+from functools import lru_cache
+import itertools
+import math
 import random
+import threading
+import numpy as np
+
+from .models import Creative
+
+
+# Колонки метрик ротатора (SoA), синхронизированные со списком креативов
+_COLUMNS = ('_impr', '_clicks', '_spend', '_ctr', '_cpc')
+
+# Обязательные поля входного креатива
+_REQUIRED_FIELDS = frozenset(('ad_id', 'ad_name', 'impressions', 'clicks', 'spend'))
+
+
+def _check_required_fields(creative: Mapping) -> None:
+    """
+    Проверяет наличие обязательных полей одной операцией над множествами.
+
+    difference принимает любой итерируемый объект: ключи словаря или
+    Creative перебираются на C, без медленного Set.__rsub__ для KeysView
+    Mapping, не являющихся dict.
+    """
+    missing = _REQUIRED_FIELDS.difference(creative)
+    if missing:
+        fields = "', '".join(sorted(missing))
+        raise ValueError(f"Отсутствуют обязательные поля '{fields}' в креативе")
+
+
+def _ctr_value(creative: Creative) -> float:
+    """CTR для колонки метрик: NaN, если у креатива нет показов."""
+    return creative.ctr if creative.impressions > 0 else math.nan
+
+
+def _cpc_value(creative: Creative) -> float:
+    """CPC для колонки метрик: NaN, если у креатива нет кликов."""
+    return creative.cpc if creative.clicks > 0 else math.nan
+
+
+def _make_creatives(creatives: Sequence[Mapping]) -> Tuple[List[Creative], Tuple[np.ndarray, ...]]:
+    """
+    Переводит креативы в Creative, рассчитывая отсутствующие CTR и CPC.
+
+    Метрики считаются для всего набора сразу операциями NumPy;
+    заданные во входных данных ctr/cpc сохраняются. Массивы,
+    собранные для расчета, возвращаются колонками ротатора, чтобы
+    _build_columns не обходил креативы повторно.
+
+    Args:
+        creatives: Входные креативы
+
+    Returns:
+        Список Creative в исходном порядке и колонки метрик в порядке
+        _COLUMNS (в CTR и CPC NaN, если нет показов/кликов)
+
+    Raises:
+        ValueError: Если в креативе нет обязательных полей
+    """
+    # Позиции креативов с заданными во входных данных CTR/CPC
+    given_ctr = []
+    given_cpc = []
+    for i, creative in enumerate(creatives):
+        _check_required_fields(creative)
+        if 'ctr' in creative:
+            given_ctr.append(i)
+        if 'cpc' in creative:
+            given_cpc.append(i)
+
+    n = len(creatives)
+    impr = np.fromiter((c['impressions'] for c in creatives), dtype=np.float64, count=n)
+    clicks = np.fromiter((c['clicks'] for c in creatives), dtype=np.float64, count=n)
+    spend = np.fromiter((c['spend'] for c in creatives), dtype=np.float64, count=n)
+
+    # CTR 0 при нуле показов, CPC не определен (NaN) при нуле кликов.
+    # CTR = clicks * 100 / impressions: одно деление на элемент вместо
+    # деления и умножения; так же считает _make_creative
+    no_impr = impr <= 0
+    no_clicks = clicks <= 0
+    ctr = np.divide(clicks * 100.0, impr, out=np.zeros(n), where=~no_impr)
+    cpc = np.divide(spend, clicks, out=np.full(n, np.nan), where=~no_clicks)
+    ctrs = ctr.tolist()
+    cpcs = cpc.tolist()
+
+    result = [
+        Creative(c['ad_id'], c['ad_name'], c['impressions'], c['clicks'], c['spend'],
+                 c['ctr'] if 'ctr' in c else ctr_value, c['cpc'] if 'cpc' in c else cpc_value)
+        for c, ctr_value, cpc_value in zip(creatives, ctrs, cpcs)
+    ]
+
+    # Колонки как у _ctr_value/_cpc_value: заданные значения, NaN без показов/кликов
+    if given_ctr:
+        ctr[given_ctr] = [creatives[i]['ctr'] for i in given_ctr]
+    if given_cpc:
+        cpc[given_cpc] = [creatives[i]['cpc'] for i in given_cpc]
+    ctr[no_impr] = np.nan
+    cpc[no_clicks] = np.nan
+
+    columns = (impr.astype(np.int64), clicks.astype(np.int64), spend, ctr, cpc)
+    return result, columns
+
+
+def _fingerprint(creatives: Sequence[Mapping]) -> Tuple[Tuple, ...]:
+    """
+    Строит ключ кэша _prepare: тройки (поле, тип, значение) каждого креатива.
+
+    1, 1.0 и True (как и Decimal("5") и 5.0) равны и имеют одинаковый
+    хеш, поэтому без типа значения такие наборы попали бы в одну
+    запись кэша и ротатор получил бы значения чужого типа.
+    """
+    return tuple(
+        tuple((key, type(value), value) for key, value in creative.items())
+        for creative in creatives
+    )
+
+
+@lru_cache(maxsize=128)
+def _prepare(key: Tuple[Tuple, ...]) -> Tuple[Tuple[Creative, ...], Tuple[np.ndarray, ...]]:
+    """
+    Валидирует креативы и рассчитывает метрики с кэшированием по отпечатку.
+
+    Повторные наборы с теми же полями (тесты, перезапуски ротации)
+    не проходят валидацию и расчет заново. Creative неизменяемы,
+    поэтому результат безопасно разделять между ротаторами; колонки
+    закрыты на запись, ротатор работает с их копиями.
+
+    Args:
+        key: Отпечаток набора (см. _fingerprint)
+
+    Returns:
+        Кортеж Creative в исходном порядке и колонки метрик (см. _make_creatives)
+    """
+    creatives, columns = _make_creatives([{name: value for name, _, value in items} for items in key])
+    for column in columns:
+        column.setflags(write=False)
+    return tuple(creatives), columns
 
 
 class RotationStrategy(Enum):
@@ -10,6 +147,79 @@ class RotationStrategy(Enum):
     LOWEST_CPC = "lowest_cpc"
 
 
+# Допустимые строковые значения стратегий: проверка без создания RotationStrategy
+_VALID_STRATEGIES = frozenset(s.value for s in RotationStrategy)
+
+
+class SimulationResult(Sequence):
+    """
+    Результат simulate_rotation.
+
+    Хранит только выбранные креативы: элементы {"iteration",
+    "chosen_creative"} создаются при обращении, а ad_ids отдает
+    идентификаторы массивом NumPy для векторной обработки.
+    """
+
+    __slots__ = ('creatives', '_ad_ids')
+
+    def __init__(self, creatives: List[Creative]):
+        """
+        Args:
+            creatives: Выбранные креативы в порядке ротации
+        """
+        self.creatives = creatives
+        self._ad_ids: Optional[np.ndarray] = None
+
+    @property
+    def ad_ids(self) -> np.ndarray:
+        """ID выбранных креативов в порядке ротации (считается один раз)."""
+        if self._ad_ids is None:
+            self._ad_ids = np.array([c.ad_id for c in self.creatives], dtype=str)
+        return self._ad_ids
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict, List[Dict]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.creatives)))]
+
+        chosen = self.creatives[index]
+        if index < 0:
+            index += len(self.creatives)
+        return {"iteration": index + 1, "chosen_creative": chosen}
+
+    def __iter__(self):
+        for i, chosen in enumerate(self.creatives, 1):
+            yield {"iteration": i, "chosen_creative": chosen}
+
+    def __len__(self) -> int:
+        return len(self.creatives)
+
+    def to_list(self) -> List[Dict]:
+        """
+        Возвращает результат списком словарей для сериализации.
+
+        json.dumps не принимает SimulationResult напрямую; to_json
+        агрегатора вызывает этот метод сам.
+
+        Returns:
+            Список {"iteration", "chosen_creative"} с креативами-словарями
+        """
+        return [{"iteration": i, "chosen_creative": chosen.to_dict()}
+                for i, chosen in enumerate(self.creatives, 1)]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, SimulationResult):
+            return self.creatives == other.creatives
+        if isinstance(other, list):
+            # Совместимость с прежним результатом - списком словарей
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"SimulationResult({self.creatives!r})"
+
+
 class CreativeRotator:
     """
     Класс для ротации креативов по заданным правилам.
@@ -20,10 +230,13 @@ class CreativeRotator:
     - lowest_cpc: креатив с минимальным CPC
     """
 
-    def __init__(self, creatives: List[Dict]):
+    def __init__(self, creatives: List[Dict], seed: Optional[int] = None):
         """
         Инициализация ротатора.
 
+        Креативы один раз переводятся в неизменяемые Creative: методы
+        выбора возвращают их без копирования.
+
         Args:
             creatives: Список креативов с их статистикой
                 Каждый элемент должен содержать поля:
@@ -34,47 +247,132 @@ class CreativeRotator:
                 - spend: расходы
                 - ctr: CTR (может быть вычислен автоматически)
                 - cpc: CPC (может быть вычислен автоматически)
+            seed: Зерно генератора случайного выбора (для воспроизводимой симуляции)
         """
         self.creatives = creatives
-        self._round_robin_index = 0
-        self._validate_creatives()
-        self._ensure_metrics()
+        self._rng = random.Random(seed)
+        self._build_columns(self._init_creatives())
+
+        # Round robin: позиция следующего креатива и cycle на C,
+        # который строится лениво при выборе (None - не построен)
+        self._rr_pos = 0
+        self._rr_iter: Optional[Iterator[Creative]] = None
+
+        # Индексы лучших креативов: считаются при первом выборе и
+        # обновляются за O(1) при изменении набора; None - не посчитан,
+        # -1 - валидных креативов нет
+        self._best_ctr_idx: Optional[int] = None
+        self._best_cpc_idx: Optional[int] = None
+        self._best_lock = threading.Lock()
+
+        # Версия набора креативов: увеличивается при каждом изменении
+        self._version = 0
+        self._stats_cache: Tuple[int, Optional[Dict]] = (-1, None)
+
+    def _build_columns(self, columns: Tuple[np.ndarray, ...]) -> None:
+        """
+        Устанавливает колоночное представление метрик (SoA) для статистики.
+
+        Массивы _impr, _clicks, _spend, _ctr, _cpc синхронизированы
+        со списком creatives по индексу: агрегаты считаются одним
+        проходом NumPy без обращения к словарям. В _ctr и _cpc
+        невалидные значения (нет показов/кликов) хранятся как NaN.
+
+        Колонки - срезы буферов _buffers с запасом емкости, поэтому
+        add_creative не копирует массивы при каждом добавлении.
+
+        Args:
+            columns: Колонки в порядке _COLUMNS, посчитанные _make_creatives
+        """
+        for name, column in zip(_COLUMNS, columns):
+            setattr(self, name, column)
+        self._buffers: Dict[str, np.ndarray] = {name: getattr(self, name) for name in _COLUMNS}
+
+    def _init_creatives(self) -> Tuple[np.ndarray, ...]:
+        """
+        Валидирует креативы, переводит их в Creative и строит индекс ad_id.
 
-    def _validate_creatives(self) -> None:
-        """Валидирует входные данные креативов."""
+        Массивы метрик собираются один раз (см. _make_creatives) и
+        служат и для векторного расчета CTR и CPC, и колонками ротатора;
+        для уже встречавшегося набора все берется из кэша _prepare.
+
+        Returns:
+            Колонки метрик в порядке _COLUMNS для _build_columns
+
+        Raises:
+            ValueError: Если список пуст или ad_id повторяются
+        """
         if not self.creatives:
             raise ValueError("Список креативов не может быть пустым")
 
-        required_fields = ['ad_id', 'ad_name', 'impressions', 'clicks', 'spend']
-        for creative in self.creatives:
-            for field in required_fields:
-                if field not in creative:
-                    raise ValueError(f"Отсутствует обязательное поле '{field}' в креативе")
-
-    def _ensure_metrics(self) -> None:
-        """Убеждается, что все метрики (CTR, CPC) рассчитаны."""
-        for creative in self.creatives:
-            # Рассчитываем CTR если отсутствует
-            if 'ctr' not in creative:
-                impressions = creative['impressions']
-                clicks = creative['clicks']
-                creative['ctr'] = (clicks / impressions * 100) if impressions > 0 else 0.0
-
-            # Рассчитываем CPC если отсутствует
-            if 'cpc' not in creative:
-                spend = creative['spend']
-                clicks = creative['clicks']
-                creative['cpc'] = (spend / clicks) if clicks > 0 else float('inf')
-
-    def choose_next(self, strategy: str = "round_robin") -> Dict:
+        try:
+            prepared, cached_columns = _prepare(_fingerprint(self.creatives))
+        except TypeError:
+            # Нехешируемые значения полей: без кэша
+            prepared, columns = _make_creatives(self.creatives)
+        else:
+            # remove_creative меняет колонки на месте
+            columns = tuple(column.copy() for column in cached_columns)
+        self.creatives = list(prepared)
+
+        # ad_id -> позиция в creatives для удаления и поиска за O(1)
+        self._index: Dict[str, int] = {c.ad_id: i for i, c in enumerate(self.creatives)}
+        if len(self._index) != len(self.creatives):
+            seen = set()
+            for creative in self.creatives:
+                if creative.ad_id in seen:
+                    raise ValueError(f"Дублирующийся ad_id: {creative.ad_id}")
+                seen.add(creative.ad_id)
+
+        return columns
+
+    @staticmethod
+    def _make_creative(creative: Mapping) -> Creative:
+        """
+        Создает Creative, рассчитывая CTR и CPC, если они отсутствуют.
+
+        Raises:
+            ValueError: Если в креативе нет обязательных полей
+        """
+        _check_required_fields(creative)
+
+        impressions = creative['impressions']
+        clicks = creative['clicks']
+        spend = creative['spend']
+
+        if 'ctr' in creative:
+            ctr = creative['ctr']
+        else:
+            ctr = (clicks * 100.0 / impressions) if impressions > 0 else 0.0
+
+        if 'cpc' in creative:
+            cpc = creative['cpc']
+        else:
+            cpc = (spend / clicks) if clicks > 0 else math.nan
+
+        return Creative(creative['ad_id'], creative['ad_name'], impressions, clicks, spend, ctr, cpc)
+
+    @property
+    def ad_ids(self) -> KeysView:
+        """
+        ID креативов в ротации.
+
+        Живое представление ключей индекса _index: проверка
+        принадлежности за O(1) без построения списка или множества.
+        """
+        return self._index.keys()
+
+    def choose_next(self, strategy: str = "round_robin") -> Creative:
         """
         Выбирает следующий креатив по заданной стратегии.
 
         Args:
-            strategy: Стратегия ротации ("round_robin", "best_ctr", "lowest_cpc")
+            strategy: Стратегия ротации ("round_robin", "best_ctr", "lowest_cpc"
+                или член RotationStrategy)
 
         Returns:
-            Словарь с данными выбранного креатива
+            Выбранный креатив (неизменяемый, общий для всех вызывающих);
+            Creative не является dict, словарь дает to_dict()
 
         Raises:
             ValueError: При неизвестной стратегии или отсутствии креативов
@@ -82,173 +380,369 @@ class CreativeRotator:
         if not self.creatives:
             raise ValueError("Нет доступных креативов для ротации")
 
-        strategy_enum = RotationStrategy(strategy)
+        # Один поиск в словаре вместо RotationStrategy(strategy) и цепочки сравнений
+        try:
+            choose = self._DISPATCH[strategy]
+        except KeyError:
+            raise ValueError(f"Неизвестная стратегия ротации: {strategy}") from None
+        return choose(self)
 
-        if strategy_enum == RotationStrategy.ROUND_ROBIN:
-            return self._round_robin_choice()
-        elif strategy_enum == RotationStrategy.BEST_CTR:
-            return self._best_ctr_choice()
-        elif strategy_enum == RotationStrategy.LOWEST_CPC:
-            return self._lowest_cpc_choice()
-        else:
-            raise ValueError(f"Неизвестная стратегия ротации: {strategy}")
-
-    def _round_robin_choice(self) -> Dict:
+    def _round_robin_choice(self) -> Creative:
         """
         Циклический выбор креатива.
 
+        Итератор cycle пересоздается только после изменения набора,
+        начиная с сохраненной позиции.
+
         Returns:
             Следующий креатив по порядку
         """
-        creative = self.creatives[self._round_robin_index]
-        self._round_robin_index = (self._round_robin_index + 1) % len(self.creatives)
-        return creative.copy()
-
-    def _best_ctr_choice(self) -> Dict:
+        rr_iter = self._rr_iter
+        if rr_iter is None:
+            creatives = self.creatives
+            if not creatives:
+                raise ValueError("Нет доступных креативов для ротации")
+            start = self._rr_pos % len(creatives)
+            self._rr_pos = start
+            rr_iter = self._rr_iter = itertools.cycle(creatives[start:] + creatives[:start])
+        self._rr_pos += 1
+        return next(rr_iter)
+
+    def _best_ctr_choice(self) -> Creative:
         """
         Выбирает креатив с максимальным CTR.
 
         Returns:
             Креатив с наибольшим CTR
         """
-        # Фильтруем креативы с показами > 0 для корректного CTR
-        valid_creatives = [c for c in self.creatives if c['impressions'] > 0]
-
-        if not valid_creatives:
+        idx = self._best_ctr_index()
+        if idx < 0:
             # Если нет креативов с показами, возвращаем случайный
-            return random.choice(self.creatives).copy()
+            return self._rng.choice(self.creatives)
 
-        best_creative = max(valid_creatives, key=lambda x: x['ctr'])
-        return best_creative.copy()
+        return self.creatives[idx]
 
-    def _lowest_cpc_choice(self) -> Dict:
+    def _lowest_cpc_choice(self) -> Creative:
         """
         Выбирает креатив с минимальным CPC.
 
         Returns:
             Креатив с наименьшим CPC
         """
-        # Фильтруем креативы с кликами > 0 для корректного CPC
-        valid_creatives = [c for c in self.creatives if c['clicks'] > 0]
-
-        if not valid_creatives:
+        idx = self._lowest_cpc_index()
+        if idx < 0:
             # Если нет креативов с кликами, возвращаем случайный
-            return random.choice(self.creatives).copy()
+            return self._rng.choice(self.creatives)
+
+        return self.creatives[idx]
+
+    def _best_ctr_index(self) -> int:
+        """Индекс креатива с максимальным CTR (-1, если креативов с показами нет)."""
+        idx = self._best_ctr_idx
+        if idx is None:
+            with self._best_lock:
+                idx = self._best_ctr_idx
+                if idx is None:
+                    # CTR креативов без показов в колонке - NaN и не учитывается
+                    idx = self._best_ctr_idx = self._arg_best(self._ctr, maximize=True)
+        return idx
+
+    def _lowest_cpc_index(self) -> int:
+        """Индекс креатива с минимальным CPC (-1, если креативов с кликами нет)."""
+        idx = self._best_cpc_idx
+        if idx is None:
+            with self._best_lock:
+                idx = self._best_cpc_idx
+                if idx is None:
+                    # CPC креативов без кликов в колонке - NaN и не учитывается
+                    idx = self._best_cpc_idx = self._arg_best(self._cpc, maximize=False)
+        return idx
+
+    @staticmethod
+    def _arg_best(values: np.ndarray, maximize: bool) -> int:
+        """
+        Индекс экстремума без учета NaN (первый при равенстве).
 
-        best_creative = min(valid_creatives, key=lambda x: x['cpc'])
-        return best_creative.copy()
+        Returns:
+            Индекс или -1, если все значения NaN
+        """
+        try:
+            return int(np.nanargmax(values) if maximize else np.nanargmin(values))
+        except ValueError:
+            return -1
+
+    # Стратегия (строка или член RotationStrategy) -> метод выбора
+    _DISPATCH: ClassVar[Dict[object, Callable[["CreativeRotator"], Creative]]] = {
+        "round_robin": _round_robin_choice,
+        "best_ctr": _best_ctr_choice,
+        "lowest_cpc": _lowest_cpc_choice,
+        RotationStrategy.ROUND_ROBIN: _round_robin_choice,
+        RotationStrategy.BEST_CTR: _best_ctr_choice,
+        RotationStrategy.LOWEST_CPC: _lowest_cpc_choice,
+    }
 
     def get_rotation_stats(self) -> Dict:
         """
         Возвращает статистику креативов для анализа ротации.
 
+        Результат кэшируется до следующего изменения набора креативов
+        (add_creative/remove_creative), поэтому повторные запросы не
+        пересчитывают агрегаты. Каждый вызов получает собственную
+        копию: изменение результата не затрагивает кэш.
+
+        Значения не округляются: форматирование (например, f"{x:.2f}")
+        остается на стороне вывода.
+
         Returns:
             Словарь со статистикой по креативам
         """
-        total_impressions = sum(c['impressions'] for c in self.creatives)
-        total_clicks = sum(c['clicks'] for c in self.creatives)
-        total_spend = sum(c['spend'] for c in self.creatives)
+        cached_version, stats = self._stats_cache
+        if cached_version != self._version:
+            stats = self._compute_rotation_stats()
+            self._stats_cache = (self._version, stats)
+        return self._copy_stats(stats)
+
+    @staticmethod
+    def _copy_stats(stats: Dict) -> Dict:
+        """Копирует статистику вместе с вложенными словарями креативов."""
+        copied = dict(stats)
+        for key in ("best_performing", "worst_performing"):
+            copied[key] = {metric: dict(creative) for metric, creative in stats[key].items()}
+        return copied
+
+    def _compute_rotation_stats(self) -> Dict:
+        """Считает статистику креативов по колонкам метрик."""
+        total_impressions = int(self._impr.sum())
+        total_clicks = int(self._clicks.sum())
+        total_spend = float(self._spend.sum())
 
         # Средние метрики
         avg_ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0
         avg_cpc = (total_spend / total_clicks) if total_clicks > 0 else 0
 
-        # Лучшие и худшие креативы
-        valid_ctr_creatives = [c for c in self.creatives if c['impressions'] > 0]
-        valid_cpc_creatives = [c for c in self.creatives if c['clicks'] > 0]
-
         stats = {
             "total_creatives": len(self.creatives),
             "total_impressions": total_impressions,
             "total_clicks": total_clicks,
-            "total_spend": round(total_spend, 2),
-            "average_ctr": round(avg_ctr, 2),
-            "average_cpc": round(avg_cpc, 2),
+            "total_spend": total_spend,
+            "average_ctr": avg_ctr,
+            "average_cpc": avg_cpc,
             "best_performing": {},
             "worst_performing": {}
         }
 
-        if valid_ctr_creatives:
-            best_ctr = max(valid_ctr_creatives, key=lambda x: x['ctr'])
-            worst_ctr = min(valid_ctr_creatives, key=lambda x: x['ctr'])
+        # Лучшие и худшие креативы: экстремумы без учета NaN (нет показов/кликов)
+        best_ctr_idx = self._arg_best(self._ctr, maximize=True)
+        if best_ctr_idx >= 0:
+            best_ctr = self.creatives[best_ctr_idx]
+            worst_ctr = self.creatives[self._arg_best(self._ctr, maximize=False)]
 
             stats["best_performing"]["ctr"] = {
-                "ad_id": best_ctr['ad_id'],
-                "ad_name": best_ctr['ad_name'],
-                "ctr": best_ctr['ctr']
+                "ad_id": best_ctr.ad_id,
+                "ad_name": best_ctr.ad_name,
+                "ctr": best_ctr.ctr
             }
             stats["worst_performing"]["ctr"] = {
-                "ad_id": worst_ctr['ad_id'],
-                "ad_name": worst_ctr['ad_name'],
-                "ctr": worst_ctr['ctr']
+                "ad_id": worst_ctr.ad_id,
+                "ad_name": worst_ctr.ad_name,
+                "ctr": worst_ctr.ctr
             }
 
-        if valid_cpc_creatives:
-            best_cpc = min(valid_cpc_creatives, key=lambda x: x['cpc'])
-            worst_cpc = max(valid_cpc_creatives, key=lambda x: x['cpc'])
+        best_cpc_idx = self._arg_best(self._cpc, maximize=False)
+        if best_cpc_idx >= 0:
+            best_cpc = self.creatives[best_cpc_idx]
+            worst_cpc = self.creatives[self._arg_best(self._cpc, maximize=True)]
 
             stats["best_performing"]["cpc"] = {
-                "ad_id": best_cpc['ad_id'],
-                "ad_name": best_cpc['ad_name'],
-                "cpc": best_cpc['cpc']
+                "ad_id": best_cpc.ad_id,
+                "ad_name": best_cpc.ad_name,
+                "cpc": best_cpc.cpc
             }
             stats["worst_performing"]["cpc"] = {
-                "ad_id": worst_cpc['ad_id'],
-                "ad_name": worst_cpc['ad_name'],
-                "cpc": worst_cpc['cpc']
+                "ad_id": worst_cpc.ad_id,
+                "ad_name": worst_cpc.ad_name,
+                "cpc": worst_cpc.cpc
             }
 
         return stats
 
+    def _invalidate(self) -> None:
+        """Сбрасывает кэш статистики, зависящий от набора креативов."""
+        self._version += 1
+
+    @staticmethod
+    def _best_after_add(best: Optional[int], values: np.ndarray, n: int,
+                        maximize: bool) -> Optional[int]:
+        """
+        Индекс экстремума после добавления значения в позицию n.
+
+        Новый креатив последний, поэтому при равенстве остается прежний.
+        """
+        if best is None:
+            return None
+
+        value = values[n]
+        if math.isnan(value):
+            return best
+        if best < 0:
+            return n
+
+        current = values[best]
+        return n if (value > current if maximize else value < current) else best
+
+    @staticmethod
+    def _best_after_remove(best: Optional[int], values: np.ndarray, i: int,
+                           n: int) -> Optional[int]:
+        """
+        Индекс экстремума после удаления позиции i, на которую перенесено
+        значение с позиции n.
+
+        Результат совпадает с _arg_best: при равенстве берется первый индекс.
+        Если удален сам экстремум, возвращается None (пересчет при выборе).
+        """
+        if best is None or best < 0:
+            return best
+        if best == i:
+            return None
+        if best == n:
+            return i
+        if i < best and values[i] == values[best]:
+            return i
+        return best
+
+    def _detach_round_robin(self, size: int) -> None:
+        """
+        Сохраняет позицию round robin и сбрасывает итератор cycle.
+
+        cycle запоминает элементы первого прохода, поэтому после
+        изменения набора итератор строится заново при следующем выборе.
+
+        Args:
+            size: Число креативов, по которым шел текущий перебор
+        """
+        self._rr_pos = self._rr_pos % size if size else 0
+        self._rr_iter = None
+
     def reset_round_robin(self) -> None:
-        """Сбрасывает индекс round robin ротации."""
-        self._round_robin_index = 0
+        """Сбрасывает round robin ротацию на первый креатив."""
+        self._rr_pos = 0
+        self._rr_iter = None
+
+    def reset_rng(self, seed: Optional[int] = None) -> None:
+        """
+        Переинициализирует генератор случайного выбора.
+
+        Args:
+            seed: Новое зерно (None - случайное)
+        """
+        self._rng.seed(seed)
 
     def add_creative(self, creative: Dict) -> None:
         """
         Добавляет новый креатив в ротацию.
 
+        Round robin продолжает перебор с текущей позиции.
+
         Args:
             creative: Словарь с данными креатива
+
+        Raises:
+            ValueError: Если нет обязательных полей или ad_id уже в ротации
         """
-        required_fields = ['ad_id', 'ad_name', 'impressions', 'clicks', 'spend']
-        for field in required_fields:
-            if field not in creative:
-                raise ValueError(f"Отсутствует обязательное поле '{field}' в креативе")
+        # Проверяем поля и вычисляем метрики если отсутствуют
+        creative = self._make_creative(creative)
+        if creative.ad_id in self._index:
+            raise ValueError(f"Дублирующийся ad_id: {creative.ad_id}")
+
+        n = len(self.creatives)
+        self._detach_round_robin(n)
+        self._index[creative.ad_id] = n
+        self.creatives.append(creative)
 
-        # Вычисляем метрики если отсутствуют
-        if 'ctr' not in creative:
-            creative['ctr'] = (creative['clicks'] / creative['impressions'] * 100) if creative['impressions'] > 0 else 0.0
+        values = (creative.impressions, creative.clicks, creative.spend,
+                  _ctr_value(creative), _cpc_value(creative))
+        for name, value in zip(_COLUMNS, values):
+            buffer = self._buffers[name]
+            if n == len(buffer):
+                # Емкость удваивается: добавление амортизированно O(1)
+                grown = np.empty(max(2 * n, 8), dtype=buffer.dtype)
+                grown[:n] = buffer[:n]
+                buffer = self._buffers[name] = grown
+            buffer[n] = value
+            setattr(self, name, buffer[:n + 1])
 
-        if 'cpc' not in creative:
-            creative['cpc'] = (creative['spend'] / creative['clicks']) if creative['clicks'] > 0 else float('inf')
+        with self._best_lock:
+            self._best_ctr_idx = self._best_after_add(self._best_ctr_idx, self._ctr, n, maximize=True)
+            self._best_cpc_idx = self._best_after_add(self._best_cpc_idx, self._cpc, n, maximize=False)
 
-        self.creatives.append(creative)
+        self._invalidate()
 
     def remove_creative(self, ad_id: str) -> bool:
         """
         Удаляет креатив из ротации по ID.
 
+        На место удаленного креатива переносится последний, поэтому
+        порядок креативов после удаления может измениться; round robin
+        продолжает с той же позиции (с первого креатива, если позиция
+        вышла за конец списка).
+
         Args:
             ad_id: ID креатива для удаления
 
         Returns:
             True если креатив был удален, False если не найден
         """
-        initial_length = len(self.creatives)
-        self.creatives = [c for c in self.creatives if c['ad_id'] != ad_id]
+        i = self._index.pop(ad_id, None)
+        if i is None:
+            return False
+
+        # Удаление за O(1): на место удаляемого креатива встает последний
+        creatives = self.creatives
+        self._detach_round_robin(len(creatives))
+        last = creatives.pop()
+        n = len(creatives)
+        if i < n:
+            creatives[i] = last
+            self._index[last.ad_id] = i
+
+        for name in _COLUMNS:
+            column = getattr(self, name)
+            column[i] = column[n]
+            setattr(self, name, column[:n])
+
+        with self._best_lock:
+            self._best_ctr_idx = self._best_after_remove(self._best_ctr_idx, self._ctr, i, n)
+            self._best_cpc_idx = self._best_after_remove(self._best_cpc_idx, self._cpc, i, n)
+
+        self._invalidate()
+        return True
+
+    def simulate_rotation(self, iterations: int, strategy: str) -> SimulationResult:
+        """
+        Симулирует последовательность ротации креативов.
 
-        # Корректируем индекс round robin если необходимо
-        if len(self.creatives) < initial_length:
-            if self._round_robin_index >= len(self.creatives):
-                self._round_robin_index = 0
-            return True
+        Обертка над simulate_rotation_compact: словари с номером
+        итерации создаются только при обращении к элементам результата.
 
-        return False
+        Args:
+            iterations: Количество итераций
+            strategy: Стратегия ротации
 
-    def simulate_rotation(self, iterations: int, strategy: str) -> List[Dict]:
+        Returns:
+            Последовательность словарей {"iteration", "chosen_creative"}
+            в порядке ротации (SimulationResult.ad_ids - массив ID)
         """
-        Симулирует последовательность ротации креативов.
+        return SimulationResult(self.simulate_rotation_compact(iterations, strategy))
+
+    def simulate_rotation_compact(self, iterations: int, strategy: str) -> List[Creative]:
+        """
+        Симулирует ротацию и возвращает только выбранные креативы.
+
+        Индексы round robin считаются одной операцией NumPy. Набор
+        креативов во время симуляции не меняется, поэтому для best_ctr
+        и lowest_cpc победитель ищется один раз и повторяется, а
+        случайный выбор (нет показов/кликов) делается одним вызовом
+        choices генератора ротатора.
 
         Args:
             iterations: Количество итераций
@@ -256,18 +750,48 @@ class CreativeRotator:
 
         Returns:
             Список выбранных креативов в порядке ротации
+
+        Raises:
+            ValueError: При неизвестной стратегии или отсутствии креативов
         """
-        rotation_sequence = []
+        if isinstance(strategy, RotationStrategy):
+            strategy = strategy.value
+        elif strategy not in _VALID_STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия ротации: {strategy}")
 
-        # Сбрасываем состояние для воспроизводимости
         if strategy == "round_robin":
-            self.reset_round_robin()
+            indices = self._simulate_indices_round_robin(iterations)
+            return list(map(self.creatives.__getitem__, indices.tolist()))
+
+        if strategy == "best_ctr":
+            idx = self._best_ctr_index()
+        else:
+            idx = self._lowest_cpc_index()
 
-        for i in range(iterations):
-            chosen = self.choose_next(strategy)
-            rotation_sequence.append({
-                "iteration": i + 1,
-                "chosen_creative": chosen
-            })
+        if idx >= 0:
+            return [self.creatives[idx]] * max(iterations, 0)
+
+        if not self.creatives:
+            raise ValueError("Нет доступных креативов для ротации")
+
+        # Случайный выбор сразу для всех итераций, без choose_next на каждой
+        return self._rng.choices(self.creatives, k=max(iterations, 0))
+
+    def _simulate_indices_round_robin(self, iterations: int) -> np.ndarray:
+        """
+        Считает индексы round robin без цикла на Python.
+
+        Для воспроизводимости перебор начинается с первого креатива;
+        после симуляции choose_next продолжает с места остановки.
+
+        Returns:
+            Массив индексов выбранных креативов
+        """
+        n = len(self.creatives)
+        if n == 0:
+            raise ValueError("Нет доступных креативов для ротации")
 
-        return rotation_sequence
+        iterations = max(iterations, 0)
+        self._rr_pos = iterations % n
+        self._rr_iter = None
+        return np.arange(iterations) % n
@@ -1,11 +1,14 @@
+"""
+Пример использования ads_aggregator.
+
+Пакет должен быть установлен (pip install -e . из корня репозитория)
+или доступен через PYTHONPATH:
+
+    PYTHONPATH=. python examples/usage_example.py
+"""
 import logging
-import sys
-import os
 from datetime import date, timedelta
 
-# Добавляем путь к родительской директории для импорта модуля
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from ads_aggregator.clients.meta_ads_client import MetaAdsClient
 from ads_aggregator.clients.google_ads_client import GoogleAdsClient
 from ads_aggregator.aggregator import AdsAggregator
@@ -139,13 +142,16 @@ def main():
         # 6. Экспорт данных в JSON
         print(" Экспорт данных в JSON...")
 
-        json_data = aggregator.to_json(aggregated_data, pretty=True)
+        # Байты без промежуточной строки (orjson, если установлен)
+        json_bytes = aggregator.to_json_bytes(aggregated_data, pretty=True)
 
-        # Показываем первые 500 символов JSON для примера
+        # Показываем первые 500 байт JSON для примера (обрезанный
+        # многобайтовый символ на границе отбрасывается)
         print("Пример JSON структуры:")
-        print(json_data[:500] + "..." if len(json_data) > 500 else json_data)
+        preview = json_bytes[:500].decode('utf-8', errors='ignore')
+        print(preview + "..." if len(json_bytes) > 500 else preview)
 
-        print(f"\n Полный JSON содержит {len(json_data)} символов")
+        print(f"\n Полный JSON занимает {len(json_bytes)} байт")
 
         # 7. Демонстрация фильтрации данных
         print("\n Фильтрация данных:")
@@ -167,6 +173,10 @@ def main():
         logger.error(f"Ошибка во время демонстрации: {e}")
         print(f" Произошла ошибка: {e}")
 
+    finally:
+        # Останавливаем пул потоков агрегатора
+        aggregator.close()
+
 
 if __name__ == "__main__":
     main()
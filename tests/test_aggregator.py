@@ -1,9 +1,14 @@
+import asyncio
+import io
+import json
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from datetime import date
-from ads_aggregator.aggregator import AdsAggregator
+from ads_aggregator.aggregator import AdsAggregator, DataIndex
 from ads_aggregator.clients.base_client import BaseAdsClient
 from ads_aggregator.exceptions import AdsAPIError
+from ads_aggregator.models import Campaign
+from ads_aggregator.rotator import CreativeRotator
 
 
 class MockAdsClient(BaseAdsClient):
@@ -57,6 +62,62 @@ class MockAdsClient(BaseAdsClient):
         ]
 
 
+class BulkMockAdsClient(MockAdsClient):
+    """Мок-клиент с несколькими кампаниями и пакетной загрузкой объявлений."""
+
+    def __init__(self, platform_name="bulk", num_campaigns=3):
+        self.num_campaigns = num_campaigns
+        self.bulk_calls = []
+        super().__init__(platform_name)
+
+    def fetch_campaigns(self, start_date, end_date):
+        return [
+            {
+                "campaign_id": f"{self._platform_name}_camp_{i}",
+                "name": f"{self._platform_name} Campaign {i}",
+                "impressions": 1000,
+                "clicks": 50,
+                "spend": 25.0
+            }
+            for i in range(self.num_campaigns)
+        ]
+
+    def fetch_ads_bulk(self, campaign_ids, start_date, end_date):
+        self.bulk_calls.append(list(campaign_ids))
+        return {
+            campaign_id: self.fetch_ads(campaign_id, start_date, end_date)
+            for campaign_id in campaign_ids
+        }
+
+
+class ValidatingMockAdsClient(BulkMockAdsClient):
+    """Мок-клиент, проверяющий даты в каждом запросе, как настоящие клиенты."""
+
+    def fetch_campaigns(self, start_date, end_date):
+        self._validate_date_range(start_date, end_date)
+        return super().fetch_campaigns(start_date, end_date)
+
+    def fetch_ads_bulk(self, campaign_ids, start_date, end_date):
+        self._validate_date_range(start_date, end_date)
+        return super().fetch_ads_bulk(campaign_ids, start_date, end_date)
+
+
+class SharedResponseMockAdsClient(BulkMockAdsClient):
+    """Мок-клиент, отдающий одни и те же объекты ответа, как ttl_cache."""
+
+    def __init__(self, platform_name="shared", num_campaigns=2):
+        self._responses = {}
+        super().__init__(platform_name, num_campaigns)
+
+    def fetch_ads_bulk(self, campaign_ids, start_date, end_date):
+        return {
+            campaign_id: self._responses.setdefault(
+                campaign_id, self.fetch_ads(campaign_id, start_date, end_date)
+            )
+            for campaign_id in campaign_ids
+        }
+
+
 class TestAdsAggregator(unittest.TestCase):
     """Тесты для класса AdsAggregator."""
 
@@ -75,6 +136,38 @@ class TestAdsAggregator(unittest.TestCase):
         self.assertEqual(self.aggregator.clients[0].platform_name, "platform1")
         self.assertEqual(self.aggregator.clients[1].platform_name, "platform2")
 
+    def test_max_workers_configuration(self):
+        """Тест настройки количества потоков."""
+        self.assertEqual(AdsAggregator([self.mock_client1], max_workers=8)._workers, 8)
+
+        with patch.dict('os.environ', {'ADS_MAX_WORKERS': '3'}):
+            clients = [MockAdsClient(f"platform{i}") for i in range(5)]
+            self.assertEqual(AdsAggregator(clients)._workers, 3)
+            self.assertEqual(AdsAggregator(clients[:1])._workers, 3)
+
+    def test_single_client_uses_parallel_path(self):
+        """Тест параллельных запросов для единственного клиента по умолчанию."""
+        with AdsAggregator([self.mock_client1]) as aggregator:
+            self.assertEqual(aggregator._workers, 2)
+            data = aggregator.aggregate_data(self.start_date, self.end_date, parallel=True)
+            self.assertIsNotNone(aggregator._executor)
+            expected = aggregator.aggregate_data(self.start_date, self.end_date, parallel=False)
+        self.assertEqual(data, expected)
+
+    def test_parallel_aggregation(self):
+        """Тест параллельной агрегации с переиспользованием пула потоков."""
+        with AdsAggregator([self.mock_client1, self.mock_client2]) as aggregator:
+            first = aggregator.aggregate_data(self.start_date, self.end_date)
+            executor = aggregator._executor
+            second = aggregator.aggregate_data(self.start_date, self.end_date)
+
+            self.assertEqual(len(first), 2)
+            self.assertEqual(len(second), 2)
+            self.assertIs(aggregator._executor, executor)
+            self.assertTrue(all(t.name.startswith('ads-agg') for t in executor._threads))
+
+        self.assertIsNone(aggregator._executor)
+
     def test_successful_aggregation(self):
         """Тест успешной агрегации данных."""
         data = self.aggregator.aggregate_data(self.start_date, self.end_date, parallel=False)
@@ -107,6 +200,104 @@ class TestAdsAggregator(unittest.TestCase):
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]["platform"], "working")
 
+    def test_ads_are_fetched_in_batches(self):
+        """Тест пакетной загрузки объявлений."""
+        client = BulkMockAdsClient(num_campaigns=3)
+        aggregator = AdsAggregator([client], batch_size=2)
+
+        data = aggregator.aggregate_data(self.start_date, self.end_date, parallel=False)
+
+        self.assertEqual(len(data), 3)
+        self.assertEqual(sum(len(ids) for ids in client.bulk_calls), 3)
+        self.assertEqual(len(client.bulk_calls), 2)
+        for campaign in data:
+            self.assertTrue(all(ad["ad_id"].startswith(campaign["campaign_id"]) for ad in campaign["ads"]))
+
+    def test_parallel_aggregation_flattens_ad_batches(self):
+        """Тест параллельной загрузки пачек объявлений всех клиентов."""
+        clients = [BulkMockAdsClient("bulk1", num_campaigns=3), BulkMockAdsClient("bulk2", num_campaigns=2)]
+
+        with AdsAggregator(clients, batch_size=2, max_workers=4) as aggregator:
+            data = aggregator.aggregate_data(self.start_date, self.end_date, parallel=True)
+
+        self.assertEqual(
+            [campaign["campaign_id"] for campaign in data],
+            ["bulk1_camp_0", "bulk1_camp_1", "bulk1_camp_2", "bulk2_camp_0", "bulk2_camp_1"]
+        )
+        self.assertEqual([len(ids) for ids in clients[0].bulk_calls], [2, 1])
+        self.assertEqual([len(ids) for ids in clients[1].bulk_calls], [2])
+        self.assertTrue(all(len(campaign["ads"]) == 2 for campaign in data))
+
+    def test_result_does_not_share_cached_ads(self):
+        """Тест независимости результата от закэшированных ответов клиента."""
+        for parallel in (False, True):
+            with self.subTest(parallel=parallel):
+                client = SharedResponseMockAdsClient()
+                with AdsAggregator([client], max_workers=2) as aggregator:
+                    first = aggregator.aggregate_data(self.start_date, self.end_date, parallel=parallel)
+                    first[0]['ads'][1]['spend'] = 0.0
+                    first[0]['ads'].clear()
+
+                    second = aggregator.aggregate_data(self.start_date, self.end_date, parallel=parallel)
+
+                self.assertEqual(len(second[0]['ads']), 2)
+                self.assertEqual(second[0]['ads'][1]['spend'], 12.5)
+
+    def test_parallel_aggregation_with_failing_client(self):
+        """Тест параллельной агрегации при ошибке одного из клиентов."""
+        failing_client = MockAdsClient("failing", should_fail=True)
+        working_client = MockAdsClient("working")
+
+        with AdsAggregator([failing_client, working_client]) as aggregator:
+            data = aggregator.aggregate_data(self.start_date, self.end_date, parallel=True)
+
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["platform"], "working")
+
+    def test_async_aggregation(self):
+        """Тест асинхронной агрегации."""
+        client = BulkMockAdsClient(num_campaigns=3)
+        failing_client = MockAdsClient("failing", should_fail=True)
+        aggregator = AdsAggregator([failing_client, client], batch_size=2)
+
+        data = asyncio.run(aggregator.aggregate_data_async(self.start_date, self.end_date))
+
+        self.assertEqual([c["campaign_id"] for c in data], ["bulk_camp_0", "bulk_camp_1", "bulk_camp_2"])
+        self.assertEqual(len(client.bulk_calls), 2)
+        for campaign in data:
+            self.assertTrue(all(ad["ad_id"].startswith(campaign["campaign_id"]) for ad in campaign["ads"]))
+
+    def test_async_aggregation_propagates_cancellation(self):
+        """Тест проброса отмены клиента из асинхронной агрегации."""
+        for method in ("fetch_campaigns_async", "fetch_ads_bulk_async"):
+            with self.subTest(method=method):
+                cancelled = BulkMockAdsClient("cancelled", num_campaigns=2)
+                setattr(cancelled, method, AsyncMock(side_effect=asyncio.CancelledError()))
+                aggregator = AdsAggregator([BulkMockAdsClient(num_campaigns=2), cancelled])
+
+                with self.assertRaises(asyncio.CancelledError):
+                    asyncio.run(aggregator.aggregate_data_async(self.start_date, self.end_date))
+
+    def test_date_range_validated_once(self):
+        """Тест однократной проверки дат за вызов агрегации."""
+        aggregator = AdsAggregator([ValidatingMockAdsClient("v1"), ValidatingMockAdsClient("v2")],
+                                   batch_size=1, max_workers=2)
+
+        with patch("ads_aggregator.clients.base_client.validate_date_range") as client_check:
+            for parallel in (False, True):
+                data = aggregator.aggregate_data(self.start_date, self.end_date, parallel=parallel)
+                self.assertEqual(len(data), 6)
+            data = asyncio.run(aggregator.aggregate_data_async(self.start_date, self.end_date))
+            self.assertEqual(len(data), 6)
+
+        aggregator.close()
+        client_check.assert_not_called()
+
+    def test_invalid_date_range(self):
+        """Тест ошибки при некорректном диапазоне дат."""
+        with self.assertRaises(ValueError):
+            self.aggregator.aggregate_data(self.end_date, self.start_date)
+
     def test_summary_stats(self):
         """Тест получения сводной статистики."""
         data = self.aggregator.aggregate_data(self.start_date, self.end_date, parallel=False)
@@ -125,6 +316,32 @@ class TestAdsAggregator(unittest.TestCase):
         # Проверяем разбивку по платформам
         self.assertIn("platform1", stats["platform_breakdown"])
         self.assertIn("platform2", stats["platform_breakdown"])
+        self.assertEqual(
+            stats["platform_breakdown"]["platform1"],
+            {"campaigns": 1, "ads": 2, "impressions": 1000, "clicks": 50, "spend": 25.0}
+        )
+
+    def test_summary_stats_large_data(self):
+        """Тест сводной статистики на большом объеме данных (NumPy)."""
+        data = [
+            {
+                "platform": f"platform{i % 3}",
+                "campaign_id": f"camp_{i}",
+                "name": f"Campaign {i}",
+                "impressions": 1000 + i,
+                "clicks": 50 + i % 7,
+                "spend": 25.25 + i % 4,
+                "ads": [{}] * (i % 5)
+            }
+            for i in range(1500)
+        ]
+
+        stats = self.aggregator.get_summary_stats(data)
+
+        self.assertEqual(stats, self.aggregator._summary_stats_python(data))
+        self.assertEqual(list(stats["platform_breakdown"]), ["platform0", "platform1", "platform2"])
+        for value in (stats["total_platforms"], stats["totals"]["impressions"], stats["totals"]["spend"]):
+            self.assertIn(type(value), (int, float))
 
     def test_json_export(self):
         """Тест экспорта в JSON."""
@@ -140,6 +357,97 @@ class TestAdsAggregator(unittest.TestCase):
         self.assertIsInstance(pretty_json, str)
         self.assertIn("\n", pretty_json)  # Форматированный JSON содержит переносы строк
 
+    def test_json_export_non_ascii(self):
+        """Тест сохранения не-ASCII символов при экспорте в JSON."""
+        data = [{"platform": "test", "name": "Кампания"}]
+
+        for pretty in (False, True):
+            json_str = self.aggregator.to_json(data, pretty=pretty)
+            self.assertIn("Кампания", json_str)
+            self.assertEqual(json.loads(json_str), data)
+
+    def test_json_bytes_export(self):
+        """Тест экспорта в JSON в виде байтов."""
+        data = self.aggregator.aggregate_data(self.start_date, self.end_date, parallel=False)
+
+        for pretty in (False, True):
+            payload = self.aggregator.to_json_bytes(data, pretty=pretty)
+            self.assertIsInstance(payload, bytes)
+            self.assertEqual(payload.decode('utf-8'), self.aggregator.to_json(data, pretty=pretty))
+
+    def test_stream_json(self):
+        """Тест потоковой записи данных в NDJSON и JSON массив."""
+        failing_client = MockAdsClient("failing", should_fail=True)
+        aggregator = AdsAggregator([self.mock_client1, failing_client, BulkMockAdsClient(num_campaigns=3)],
+                                   batch_size=2)
+        expected = aggregator.aggregate_data(self.start_date, self.end_date, parallel=False)
+
+        buffer = io.BytesIO()
+        written = aggregator.stream_json(buffer, self.start_date, self.end_date)
+        lines = buffer.getvalue().splitlines()
+        self.assertEqual(written, 4)
+        self.assertEqual([json.loads(line) for line in lines], expected)
+
+        buffer = io.BytesIO()
+        aggregator.stream_json(buffer, self.start_date, self.end_date, ndjson=False)
+        self.assertEqual(json.loads(buffer.getvalue()), expected)
+
+        buffer = io.BytesIO()
+        AdsAggregator([failing_client]).stream_json(buffer, self.start_date, self.end_date, ndjson=False)
+        self.assertEqual(json.loads(buffer.getvalue()), [])
+
+    def test_json_export_simulation_result(self):
+        """Тест экспорта результата симуляции ротации в JSON."""
+        rotator = CreativeRotator([
+            {"ad_id": "ad_1", "ad_name": "Ad 1", "impressions": 100, "clicks": 5, "spend": 2.5},
+            {"ad_id": "ad_2", "ad_name": "Ad 2", "impressions": 200, "clicks": 4, "spend": 2.0},
+        ])
+        result = rotator.simulate_rotation(3, "round_robin")
+        expected = [
+            {"iteration": i, "chosen_creative": rotator.creatives[(i - 1) % 2].to_dict()}
+            for i in range(1, 4)
+        ]
+        self.assertEqual(result.to_list(), expected)
+
+        self.assertEqual(json.loads(self.aggregator.to_json(result)), expected)
+        self.assertEqual(json.loads(self.aggregator.to_json_bytes(result, pretty=False)), expected)
+        with patch('ads_aggregator.aggregator.orjson', None):
+            self.assertEqual(json.loads(self.aggregator.to_json(result)), expected)
+
+    def test_stream_json_requests_ads_in_window(self):
+        """Тест запроса объявлений не больше чем на две пачки вперед."""
+        client = BulkMockAdsClient(num_campaigns=10)
+        calls_at_write = []
+
+        class RecordingBuffer(io.BytesIO):
+            def write(self, data):
+                if data != b'\n':
+                    calls_at_write.append(len(client.bulk_calls))
+                return super().write(data)
+
+        written = AdsAggregator([client], batch_size=2).stream_json(
+            RecordingBuffer(), self.start_date, self.end_date
+        )
+
+        self.assertEqual(written, 10)
+        self.assertLessEqual(calls_at_write[0], 2)
+        self.assertTrue(all(len(ids) <= 2 for ids in client.bulk_calls))
+        self.assertEqual(sum(map(len, client.bulk_calls)), 10)
+
+    def test_aggregate_records(self):
+        """Тест агрегации в компактные записи."""
+        data = self.aggregator.aggregate_data(self.start_date, self.end_date, parallel=False)
+        records = self.aggregator.aggregate_records(self.start_date, self.end_date, parallel=False)
+
+        self.assertTrue(all(isinstance(record, Campaign) for record in records))
+        self.assertFalse(hasattr(records[0], '__dict__'))
+        self.assertEqual(records[0].ads[0].ad_id, "platform1_camp_1_ad_1")
+        self.assertEqual([record.to_dict() for record in records], data)
+        self.assertEqual(json.loads(self.aggregator.to_json_bytes(records)), data)
+
+        with patch('ads_aggregator.aggregator.orjson', None):
+            self.assertEqual(json.loads(self.aggregator.to_json(records)), data)
+
     def test_platform_filtering(self):
         """Тест фильтрации по платформе."""
         data = self.aggregator.aggregate_data(self.start_date, self.end_date, parallel=False)
@@ -165,6 +473,52 @@ class TestAdsAggregator(unittest.TestCase):
         very_high_spend_data = self.aggregator.filter_by_spend_threshold(data, 30.0)
         self.assertEqual(len(very_high_spend_data), 0)  # Ни одна кампания не имеет spend >= 30.0
 
+    def test_filtering_with_index(self):
+        """Тест фильтрации по построенному индексу."""
+        data = [
+            {"platform": "meta", "campaign_id": "c1", "spend": 30.0},
+            {"platform": "google", "campaign_id": "c2", "spend": 10.0},
+            {"platform": "meta", "campaign_id": "c3", "spend": 20.0},
+            {"platform": "google", "campaign_id": "c4", "spend": 40.0},
+        ]
+        expected_platform = self.aggregator.filter_by_platform(data, "meta")
+        expected_spend = self.aggregator.filter_by_spend_threshold(data, 20.0)
+
+        index = self.aggregator.build_index(data)
+
+        self.assertIsInstance(index, DataIndex)
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.filter_by_platform("meta"), expected_platform)
+        self.assertEqual(index.filter_by_platform("nonexistent"), [])
+        self.assertEqual(index.filter_by_spend_threshold(20.0), expected_spend)
+        self.assertEqual(
+            [c["campaign_id"] for c in index.filter_by_spend_threshold(20.0)],
+            ["c1", "c3", "c4"]
+        )
+        self.assertEqual(index.filter_by_spend_threshold(50.0), [])
+
+    def test_index_is_snapshot(self):
+        """Тест независимости фильтров агрегатора от построенного индекса."""
+        data = [
+            {"platform": "meta", "campaign_id": "c1", "spend": 30.0},
+            {"platform": "google", "campaign_id": "c2", "spend": 10.0},
+        ]
+        index = self.aggregator.build_index(data)
+        data.append({"platform": "meta", "campaign_id": "c3", "spend": 50.0})
+        data.pop(0)
+
+        # Фильтры агрегатора видят текущие данные
+        self.assertEqual(
+            [c["campaign_id"] for c in self.aggregator.filter_by_platform(data, "meta")], ["c3"]
+        )
+        self.assertEqual(
+            [c["campaign_id"] for c in self.aggregator.filter_by_spend_threshold(data, 20.0)], ["c3"]
+        )
+
+        # Индекс остается снимком на момент построения
+        self.assertEqual([c["campaign_id"] for c in index.filter_by_platform("meta")], ["c1"])
+        self.assertEqual([c["campaign_id"] for c in index.filter_by_spend_threshold(20.0)], ["c1"])
+
 
 if __name__ == '__main__':
     unittest.main()
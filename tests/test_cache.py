@@ -0,0 +1,137 @@
+import json
+import time
+import unittest
+from datetime import date
+from ads_aggregator import cache as cache_module
+from ads_aggregator.cache import MemoryCache, RedisCache, ttl_cache
+from ads_aggregator.clients.base_client import BaseAdsClient
+from ads_aggregator.exceptions import RateLimitError
+
+
+class CountingClient(BaseAdsClient):
+    """Мок-клиент, считающий обращения к API."""
+
+    cache = MemoryCache()
+
+    def __init__(self, account_id="acc_1"):
+        self.account_id = account_id
+        self.calls = 0
+        self.fail_with = None
+        super().__init__({"test": "credentials"})
+
+    def _get_platform_name(self):
+        return "counting"
+
+    def _get_account_id(self):
+        return self.account_id
+
+    @ttl_cache(ttl=0.05, stale=0.1, cache=cache)
+    def fetch_campaigns(self, start_date, end_date):
+        self.calls += 1
+        if self.fail_with:
+            raise self.fail_with
+        return [{"campaign_id": f"camp_{self.calls}"}]
+
+    @ttl_cache(ttl=0.05, stale=0.1, cache=cache)
+    def fetch_ads(self, campaign_id, start_date, end_date):
+        self.calls += 1
+        return [{"ad_id": f"{campaign_id}_ad_{self.calls}"}]
+
+
+class TestTTLCache(unittest.TestCase):
+    """Тесты для декоратора ttl_cache."""
+
+    def setUp(self):
+        """Подготовка тестовых данных."""
+        CountingClient.cache.clear()
+        self.client = CountingClient()
+        self.start_date = date(2023, 1, 1)
+        self.end_date = date(2023, 1, 31)
+
+    def test_fresh_hit(self):
+        """Тест повторного запроса в пределах ttl."""
+        first = self.client.fetch_campaigns(self.start_date, self.end_date)
+        second = self.client.fetch_campaigns(self.start_date, self.end_date)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.client.calls, 1)
+
+    def test_key_includes_arguments_and_account(self):
+        """Тест разделения ключей по аргументам и аккаунту."""
+        self.client.fetch_ads("camp_1", self.start_date, self.end_date)
+        self.client.fetch_ads("camp_2", self.start_date, self.end_date)
+        self.client.fetch_ads("camp_1", self.start_date, date(2023, 2, 1))
+        self.assertEqual(self.client.calls, 3)
+
+        other = CountingClient(account_id="acc_2")
+        other.fetch_ads("camp_1", self.start_date, self.end_date)
+        self.assertEqual(other.calls, 1)
+
+    def test_stale_value_is_served_and_refreshed(self):
+        """Тест отдачи устаревшего значения с обновлением в фоне."""
+        first = self.client.fetch_campaigns(self.start_date, self.end_date)
+        time.sleep(0.07)
+
+        stale = self.client.fetch_campaigns(self.start_date, self.end_date)
+        self.assertEqual(stale, first)
+
+        # Ждем завершения фонового обновления
+        deadline = time.time() + 1.0
+        while (self.client.calls < 2 or cache_module._refreshing) and time.time() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(self.client.calls, 2)
+        refreshed = self.client.fetch_campaigns(self.start_date, self.end_date)
+        self.assertEqual(refreshed, [{"campaign_id": "camp_2"}])
+
+    def test_fallback_on_rate_limit(self):
+        """Тест возврата последних данных при RateLimitError."""
+        first = self.client.fetch_campaigns(self.start_date, self.end_date)
+        time.sleep(0.2)
+
+        self.client.fail_with = RateLimitError("Превышен лимит")
+        self.assertEqual(self.client.fetch_campaigns(self.start_date, self.end_date), first)
+
+    def test_error_without_cached_value(self):
+        """Тест пробрасывания ошибки при пустом кэше."""
+        self.client.fail_with = RateLimitError("Превышен лимит")
+
+        with self.assertRaises(RateLimitError):
+            self.client.fetch_campaigns(self.start_date, self.end_date)
+
+
+class FakeRedis:
+    """Минимальная замена redis.Redis: get/set в словаре."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+class TestRedisCache(unittest.TestCase):
+    """Тесты для RedisCache."""
+
+    def test_entries_are_stored_as_json(self):
+        """Тест хранения записей в JSON вместо pickle."""
+        redis = FakeRedis()
+        cache = RedisCache(client=redis)
+        value = [{"campaign_id": "c1", "name": "Кампания", "spend": 25.0}]
+
+        cache.set(("google", "acc_1", "fetch_campaigns"), value, ttl=60, stale=300)
+
+        raw, = redis.data.values()
+        self.assertEqual(json.loads(raw)[3], value)
+
+        timestamp, stale_at, expires_at, cached = cache.get(("google", "acc_1", "fetch_campaigns"))
+        self.assertEqual(cached, value)
+        self.assertEqual(stale_at - timestamp, 60)
+        self.assertEqual(expires_at - timestamp, 360)
+        self.assertIsNone(cache.get("missing"))
+
+
+if __name__ == '__main__':
+    unittest.main()
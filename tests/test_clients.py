@@ -0,0 +1,117 @@
+import asyncio
+import unittest
+from datetime import date
+from unittest.mock import AsyncMock, patch
+import numpy as np
+from ads_aggregator.clients.google_ads_client import GoogleAdsClient
+from ads_aggregator.clients.meta_ads_client import MetaAdsClient
+
+
+class TestClientMetrics(unittest.TestCase):
+    """Тесты расчета метрик в клиентах платформ."""
+
+    def setUp(self):
+        """Подготовка тестовых данных."""
+        self.client = MetaAdsClient({
+            "access_token": "test_access_token",
+            "app_id": "app",
+            "app_secret": "secret",
+            "account_id": "act_1"
+        })
+
+    def test_vectorized_metrics_match_scalar(self):
+        """Тест совпадения векторных CTR/CPC со скалярными."""
+        impressions = np.array([0, 1000, 333, 4000])
+        clicks = np.array([0, 0, 7, 129])
+        spend = np.array([0.0, 12.5, 3.33, 77.77])
+
+        ctr = self.client._calculate_ctr_vec(impressions, clicks)
+        cpc = self.client._calculate_cpc_vec(spend, clicks)
+
+        # np.round и round могут расходиться на половинах последнего разряда
+        for i in range(len(impressions)):
+            self.assertAlmostEqual(ctr[i], self.client._calculate_ctr(int(impressions[i]), int(clicks[i])),
+                                   delta=0.011)
+            self.assertAlmostEqual(cpc[i], self.client._calculate_cpc(float(spend[i]), int(clicks[i])),
+                                   delta=0.011)
+        self.assertEqual(ctr[0], 0.0)
+        self.assertEqual(cpc[:2].tolist(), [0.0, 0.0])
+
+    def test_mock_ads_metrics(self):
+        """Тест метрик в мок данных объявлений."""
+        google = GoogleAdsClient({
+            "developer_token": "token",
+            "client_id": "id",
+            "client_secret": "secret",
+            "refresh_token": "refresh",
+            "customer_id": "123"
+        })
+
+        for client in (self.client, google):
+            for ad in client._mock_ads("camp_1"):
+                self.assertIsInstance(ad["impressions"], int)
+                self.assertIsInstance(ad["ctr"], float)
+                self.assertAlmostEqual(ad["ctr"], client._calculate_ctr(ad["impressions"], ad["clicks"]),
+                                       delta=0.011)
+                self.assertAlmostEqual(ad["cpc"], client._calculate_cpc(ad["spend"], ad["clicks"]),
+                                       delta=0.011)
+
+
+class TestGoogleQueryBuilder(unittest.TestCase):
+    """Тесты построения GAQL запросов."""
+
+    def setUp(self):
+        """Подготовка тестовых данных."""
+        self.client = GoogleAdsClient({
+            "developer_token": "token",
+            "client_id": "id",
+            "client_secret": "secret",
+            "refresh_token": "refresh",
+            "customer_id": "123"
+        })
+        self.dates = {"start_date": date(2023, 1, 1), "end_date": date(2023, 1, 31)}
+
+    def test_campaigns_query(self):
+        """Тест запроса кампаний."""
+        query = self.client._build_gaql_query("campaigns", **self.dates)
+        self.assertIn("FROM campaign WHERE segments.date BETWEEN '2023-01-01' AND '2023-01-31'", query)
+
+    def test_ads_query(self):
+        """Тест запроса объявлений по одной и нескольким кампаниям."""
+        bulk = self.client._build_gaql_query("ads", campaign_ids=[11, 12], **self.dates)
+        single = self.client._build_gaql_query("ads", campaign_id=11, **self.dates)
+
+        self.assertIn("WHERE campaign.id IN (11, 12) AND segments.date BETWEEN", bulk)
+        self.assertIn("WHERE campaign.id IN (11) AND", single)
+        with self.assertRaises(ValueError):
+            self.client._build_gaql_query("unknown", **self.dates)
+
+
+
+class TestAsyncAdsCaching(unittest.TestCase):
+    """Тесты кэширования асинхронной загрузки объявлений."""
+
+    def test_fetch_ads_async_is_cached_once(self):
+        """Тест отсутствия второго кэша поверх fetch_ads_bulk_async."""
+        clients = (
+            MetaAdsClient({"access_token": "token", "app_id": "app",
+                           "app_secret": "secret", "account_id": "act_1"}),
+            GoogleAdsClient({"developer_token": "token", "client_id": "id", "client_secret": "secret",
+                             "refresh_token": "refresh", "customer_id": "123"}),
+        )
+        start_date, end_date = date(2023, 1, 1), date(2023, 1, 31)
+
+        for client in clients:
+            with self.subTest(platform=client.platform_name):
+                bulk = AsyncMock(return_value={"camp_1": [{"ad_id": "ad_1"}]})
+                with patch.object(client, "fetch_ads_bulk_async", bulk):
+                    for _ in range(2):
+                        ads = asyncio.run(client.fetch_ads_async("camp_1", start_date, end_date))
+                        self.assertEqual(ads, [{"ad_id": "ad_1"}])
+
+                # Каждый вызов идет в кэшируемый fetch_ads_bulk_async
+                self.assertEqual(bulk.await_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
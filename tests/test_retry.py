@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+from ads_aggregator.exceptions import AuthenticationError, RateLimitError
+from ads_aggregator.retry import retry
+
+
+class FlakyService:
+    """Мок-сервис, падающий заданное количество раз."""
+
+    def __init__(self, failures, error=None):
+        self.failures = failures
+        self.error = error or RateLimitError("Превышен лимит")
+        self.calls = 0
+
+    @retry(tries=3, base_delay=0.001, max_delay=0.01)
+    def fetch(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return "ok"
+
+    @retry(tries=3, base_delay=0.001, max_delay=0.01)
+    async def fetch_async(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return "ok"
+
+
+class TestRetry(unittest.TestCase):
+    """Тесты для декоратора retry."""
+
+    def test_recovers_after_rate_limit(self):
+        """Тест успешного повтора после RateLimitError."""
+        service = FlakyService(failures=2)
+        self.assertEqual(service.fetch(), "ok")
+        self.assertEqual(service.calls, 3)
+
+    def test_raises_after_last_attempt(self):
+        """Тест пробрасывания ошибки после исчерпания попыток."""
+        service = FlakyService(failures=5)
+        with self.assertRaises(RateLimitError):
+            service.fetch()
+        self.assertEqual(service.calls, 3)
+
+    def test_other_errors_are_not_retried(self):
+        """Тест отсутствия повторов для других ошибок."""
+        service = FlakyService(failures=1, error=AuthenticationError("Токен истек"))
+        with self.assertRaises(AuthenticationError):
+            service.fetch()
+        self.assertEqual(service.calls, 1)
+
+    def test_retry_after_is_respected(self):
+        """Тест паузы из Retry-After, не превышающего max_delay."""
+        service = FlakyService(failures=2, error=RateLimitError("Превышен лимит", retry_after=0.005))
+        with patch("ads_aggregator.retry.time.sleep") as sleep:
+            self.assertEqual(service.fetch(), "ok")
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.005, 0.005])
+
+    def test_retry_after_above_max_delay_is_raised(self):
+        """Тест пробрасывания ошибки, если Retry-After больше max_delay."""
+        service = FlakyService(failures=2, error=RateLimitError("Превышен лимит", retry_after=30))
+        with patch("ads_aggregator.retry.time.sleep") as sleep:
+            with self.assertRaises(RateLimitError):
+                service.fetch()
+        sleep.assert_not_called()
+        self.assertEqual(service.calls, 1)
+
+    def test_async_retry(self):
+        """Тест повторов для асинхронных функций."""
+        service = FlakyService(failures=1)
+        self.assertEqual(asyncio.run(service.fetch_async()), "ok")
+        self.assertEqual(service.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,13 +1,20 @@
+import json
+import math
 import unittest
+import unittest.mock
+import numpy as np
+from types import MappingProxyType
+from ads_aggregator.models import Creative
 from ads_aggregator.rotator import CreativeRotator, RotationStrategy
 
 
-class TestCreativeRotator(unittest.TestCase):
-    """Тесты для класса CreativeRotator."""
+class CreativeRotatorTestCase(unittest.TestCase):
+    """Общие тестовые данные для тестов CreativeRotator."""
 
-    def setUp(self):
-        """Подготовка тестовых данных."""
-        self.test_creatives = [
+    @classmethod
+    def setUpClass(cls):
+        """Подготовка тестовых данных: один неизменяемый шаблон на класс."""
+        cls._TEMPLATE = tuple(MappingProxyType(creative) for creative in [
             {
                 "ad_id": "ad_1",
                 "ad_name": "Creative A",
@@ -35,26 +42,62 @@ class TestCreativeRotator(unittest.TestCase):
                 "ctr": 5.0,
                 "cpc": 0.5
             }
-        ]
+        ])
+
+
+class TestCreativeRotator(CreativeRotatorTestCase):
+    """Тесты для класса CreativeRotator, не изменяющие набор креативов."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Один ротатор на класс: тесты не меняют набор креативов."""
+        super().setUpClass()
+        cls._rotator = CreativeRotator(cls._TEMPLATE)
+
+    def setUp(self):
+        """Тесты только читают шаблон, поэтому используют его без копирования."""
+        self.test_creatives = self._TEMPLATE
+        # Состояние общего ротатора между тестами - только позиция round robin
+        self._rotator.reset_round_robin()
 
     def test_rotator_initialization(self):
         """Тест инициализации ротатора."""
-        rotator = CreativeRotator(self.test_creatives)
+        rotator = self._rotator
         self.assertEqual(len(rotator.creatives), 3)
-        self.assertEqual(rotator._round_robin_index, 0)
+        self.assertEqual(rotator.choose_next("round_robin")['ad_id'], "ad_1")
+
+    def test_chosen_creative_to_dict(self):
+        """Тест перевода выбранного креатива в словарь для сериализации."""
+        creative = self._rotator.choose_next("best_ctr")
+        self.assertNotIsInstance(creative, dict)
+
+        as_dict = creative.to_dict()
+        self.assertIsInstance(as_dict, dict)
+        self.assertEqual(as_dict, dict(creative))
+        self.assertEqual(json.loads(json.dumps(as_dict)), as_dict)
 
     def test_empty_creatives_validation(self):
         """Тест валидации пустого списка креативов."""
         with self.assertRaises(ValueError):
             CreativeRotator([])
 
+    def test_duplicate_ad_id_validation(self):
+        """Тест отказа при повторяющихся ad_id."""
+        duplicated = [dict(self.test_creatives[0]), dict(self.test_creatives[0])]
+        with self.assertRaises(ValueError):
+            CreativeRotator(duplicated)
+
     def test_missing_required_fields(self):
         """Тест валидации отсутствующих обязательных полей."""
         invalid_creative = [{"ad_id": "test", "ad_name": "Test"}]  # Отсутствуют другие поля
 
-        with self.assertRaises(ValueError):
+        with self.assertRaises(ValueError) as context:
             CreativeRotator(invalid_creative)
 
+        # В сообщении перечислены все отсутствующие поля
+        for field in ('impressions', 'clicks', 'spend'):
+            self.assertIn(field, str(context.exception))
+
     def test_automatic_metrics_calculation(self):
         """Тест автоматического расчета CTR и CPC."""
         creatives_without_metrics = [
@@ -71,7 +114,7 @@ class TestCreativeRotator(unittest.TestCase):
         rotator = CreativeRotator(creatives_without_metrics)
         creative = rotator.creatives[0]
 
-        # CTR должен быть рассчитан как (50/1000)*100 = 5.0
+        # CTR должен быть рассчитан как 50*100/1000 = 5.0
         self.assertEqual(creative['ctr'], 5.0)
 
         # CPC должен быть рассчитан как 25.0/50 = 0.5
@@ -79,27 +122,17 @@ class TestCreativeRotator(unittest.TestCase):
 
     def test_round_robin_strategy(self):
         """Тест стратегии round_robin."""
-        rotator = CreativeRotator(self.test_creatives)
-
-        # Первый выбор должен быть ad_1
-        first_choice = rotator.choose_next("round_robin")
-        self.assertEqual(first_choice['ad_id'], "ad_1")
-
-        # Второй выбор должен быть ad_2
-        second_choice = rotator.choose_next("round_robin")
-        self.assertEqual(second_choice['ad_id'], "ad_2")
+        rotator = self._rotator
 
-        # Третий выбор должен быть ad_3
-        third_choice = rotator.choose_next("round_robin")
-        self.assertEqual(third_choice['ad_id'], "ad_3")
-
-        # Четвертый выбор должен снова быть ad_1 (цикл)
-        fourth_choice = rotator.choose_next("round_robin")
-        self.assertEqual(fourth_choice['ad_id'], "ad_1")
+        # Креативы по порядку, четвертый выбор - снова ad_1 (цикл)
+        expected = ["ad_1", "ad_2", "ad_3", "ad_1"]
+        for i, expected_id in enumerate(expected):
+            with self.subTest(i=i):
+                self.assertEqual(rotator.choose_next("round_robin")['ad_id'], expected_id)
 
     def test_best_ctr_strategy(self):
         """Тест стратегии best_ctr."""
-        rotator = CreativeRotator(self.test_creatives)
+        rotator = self._rotator
 
         # У Creative A и Creative C CTR = 5.0 (максимальный)
         # Должен вернуться один из них (первый найденный)
@@ -109,47 +142,52 @@ class TestCreativeRotator(unittest.TestCase):
 
     def test_lowest_cpc_strategy(self):
         """Тест стратегии lowest_cpc."""
-        rotator = CreativeRotator(self.test_creatives)
+        rotator = self._rotator
 
         # У всех креативов CPC = 0.5, должен вернуться первый найденный
         lowest_cpc_choice = rotator.choose_next("lowest_cpc")
         self.assertEqual(lowest_cpc_choice['cpc'], 0.5)
 
+    def test_choices_are_shared_immutable_creatives(self):
+        """Тест возврата общих неизменяемых креативов без копирования."""
+        rotator = self._rotator
+
+        first = rotator.choose_next("best_ctr")
+        self.assertIs(rotator.choose_next("best_ctr"), first)
+        self.assertIsInstance(first, Creative)
+        self.assertEqual(first, self.test_creatives[0])
+        with self.assertRaises(AttributeError):
+            first.ctr = 100.0
+
     def test_ctr_calculation(self):
         """Тест правильности расчета CTR."""
-        # CTR = (clicks / impressions) * 100
-        impressions = 1000
-        clicks = 75
-        expected_ctr = (clicks / impressions) * 100  # 7.5%
+        # CTR = clicks * 100 / impressions: (показы, клики, ожидаемый CTR)
+        cases = [(1000, 75, 7.5), (800, 32, 4.0), (40, 3, 7.5), (0, 0, 0.0)]
 
-        test_creative = [{
-            "ad_id": "test",
-            "ad_name": "Test Creative",
-            "impressions": impressions,
-            "clicks": clicks,
-            "spend": 50.0
-        }]
+        rotator = CreativeRotator([
+            {"ad_id": f"test_{i}", "ad_name": "Test Creative",
+             "impressions": impressions, "clicks": clicks, "spend": 50.0}
+            for i, (impressions, clicks, _) in enumerate(cases)
+        ])
 
-        rotator = CreativeRotator(test_creative)
-        self.assertEqual(rotator.creatives[0]['ctr'], expected_ctr)
+        for creative, (impressions, clicks, expected_ctr) in zip(rotator.creatives, cases):
+            with self.subTest(impressions=impressions, clicks=clicks):
+                self.assertEqual(creative['ctr'], expected_ctr)
 
     def test_cpc_calculation(self):
         """Тест правильности расчета CPC."""
-        # CPC = spend / clicks
-        spend = 100.0
-        clicks = 25
-        expected_cpc = spend / clicks  # 4.0
+        # CPC = spend / clicks: (расходы, клики, ожидаемый CPC)
+        cases = [(100.0, 25, 4.0), (16.0, 32, 0.5), (12.5, 25, 0.5)]
 
-        test_creative = [{
-            "ad_id": "test",
-            "ad_name": "Test Creative",
-            "impressions": 1000,
-            "clicks": clicks,
-            "spend": spend
-        }]
+        rotator = CreativeRotator([
+            {"ad_id": f"test_{i}", "ad_name": "Test Creative",
+             "impressions": 1000, "clicks": clicks, "spend": spend}
+            for i, (spend, clicks, _) in enumerate(cases)
+        ])
 
-        rotator = CreativeRotator(test_creative)
-        self.assertEqual(rotator.creatives[0]['cpc'], expected_cpc)
+        for creative, (spend, clicks, expected_cpc) in zip(rotator.creatives, cases):
+            with self.subTest(spend=spend, clicks=clicks):
+                self.assertEqual(creative['cpc'], expected_cpc)
 
     def test_zero_impressions_ctr(self):
         """Тест расчета CTR при нулевых показах."""
@@ -175,12 +213,12 @@ class TestCreativeRotator(unittest.TestCase):
         }]
 
         rotator = CreativeRotator(test_creative)
-        # При нулевых кликах CPC должен быть inf
-        self.assertEqual(rotator.creatives[0]['cpc'], float('inf'))
+        # При нулевых кликах CPC не определен (NaN)
+        self.assertTrue(math.isnan(rotator.creatives[0]['cpc']))
 
     def test_rotation_stats(self):
         """Тест получения статистики ротации."""
-        rotator = CreativeRotator(self.test_creatives)
+        rotator = self._rotator
         stats = rotator.get_rotation_stats()
 
         # Проверяем основные поля статистики
@@ -189,10 +227,232 @@ class TestCreativeRotator(unittest.TestCase):
         self.assertEqual(stats['total_clicks'], 115)        # 50+40+25
         self.assertEqual(stats['total_spend'], 57.5)        # 25+20+12.5
 
+        # Средние метрики возвращаются без округления
+        self.assertEqual(stats['average_ctr'], 115 / 3500 * 100)
+        self.assertEqual(stats['average_cpc'], 57.5 / 115)
+
         # Проверяем наличие информации о лучших креативах
         self.assertIn('best_performing', stats)
         self.assertIn('worst_performing', stats)
 
+    def test_simulation(self):
+        """Тест симуляции ротации."""
+        rotator = self._rotator
+
+        # Тестируем симуляцию на 5 итераций
+        simulation = rotator.simulate_rotation(5, "round_robin")
+
+        self.assertEqual(len(simulation), 5)
+        np.testing.assert_array_equal(simulation.ad_ids, ["ad_1", "ad_2", "ad_3", "ad_1", "ad_2"])
+
+        # Элементы - словари {"iteration", "chosen_creative"}, создаваемые при обращении
+        self.assertEqual(simulation[0], {"iteration": 1, "chosen_creative": rotator.creatives[0]})
+        self.assertEqual(simulation[-1]['iteration'], 5)
+        self.assertEqual([step['iteration'] for step in simulation[1:3]], [2, 3])
+        self.assertEqual(simulation, list(simulation))
+
+    def test_simulation_compact(self):
+        """Тест компактной симуляции без словарей-оберток."""
+        rotator = self._rotator
+        compact = rotator.simulate_rotation_compact(5, "round_robin")
+
+        self.assertEqual([c.ad_id for c in compact], ["ad_1", "ad_2", "ad_3", "ad_1", "ad_2"])
+        self.assertEqual(
+            [step['chosen_creative'] for step in rotator.simulate_rotation(5, "round_robin")],
+            compact
+        )
+
+    def test_static_simulation_computes_best_once(self):
+        """Тест однократного поиска лучшего креатива в симуляции."""
+        rotator = CreativeRotator(self.test_creatives)
+
+        with unittest.mock.patch.object(CreativeRotator, "_arg_best",
+                                        wraps=CreativeRotator._arg_best) as arg_best:
+            for strategy in ("best_ctr", "lowest_cpc"):
+                sequence = rotator.simulate_rotation_compact(50, strategy)
+                self.assertEqual(sequence, [rotator.choose_next(strategy)] * 50)
+            self.assertEqual(arg_best.call_count, 2)
+
+    def test_seeded_random_fallback(self):
+        """Тест воспроизводимости случайного выбора при заданном seed."""
+        no_clicks = [
+            {"ad_id": f"ad_{i}", "ad_name": f"Creative {i}", "impressions": 0, "clicks": 0, "spend": 0.0}
+            for i in range(10)
+        ]
+        rotator = CreativeRotator(no_clicks, seed=42)
+
+        first = [step['chosen_creative']['ad_id'] for step in rotator.simulate_rotation(20, "lowest_cpc")]
+        rotator.reset_rng(42)
+        second = [step['chosen_creative']['ad_id'] for step in rotator.simulate_rotation(20, "lowest_cpc")]
+        other = [step['chosen_creative']['ad_id']
+                 for step in CreativeRotator(no_clicks, seed=42).simulate_rotation(20, "lowest_cpc")]
+
+        self.assertEqual(first, second)
+        self.assertEqual(first, other)
+
+    def test_invalid_strategy(self):
+        """Тест обработки неверной стратегии."""
+        rotator = self._rotator
+
+        with self.assertRaises(ValueError):
+            rotator.choose_next("invalid_strategy")
+
+        with self.assertRaises(ValueError):
+            rotator.simulate_rotation(3, "invalid_strategy")
+
+    def test_strategy_enum(self):
+        """Тест выбора стратегии членом RotationStrategy."""
+        rotator = self._rotator
+
+        self.assertEqual(rotator.choose_next(RotationStrategy.ROUND_ROBIN)['ad_id'], "ad_1")
+        self.assertEqual(rotator.choose_next(RotationStrategy.BEST_CTR)['ctr'], 5.0)
+        self.assertEqual(rotator.choose_next(RotationStrategy.LOWEST_CPC)['cpc'], 0.5)
+
+    def test_reset_round_robin(self):
+        """Тест сброса индекса round_robin."""
+        rotator = self._rotator
+
+        # Делаем несколько выборов
+        rotator.choose_next("round_robin")
+        self.assertEqual(rotator.choose_next("round_robin")['ad_id'], "ad_2")
+
+        # Сбрасываем
+        rotator.reset_round_robin()
+
+        # Следующий выбор должен быть первый креатив
+        choice = rotator.choose_next("round_robin")
+        self.assertEqual(choice['ad_id'], "ad_1")
+
+
+class TestCreativeRotatorMutating(CreativeRotatorTestCase):
+    """Тесты CreativeRotator, добавляющие и удаляющие креативы."""
+
+    def setUp(self):
+        """Подготовка тестовых данных: собственная копия шаблона."""
+        self.test_creatives = [dict(creative) for creative in self._TEMPLATE]
+
+    def test_best_choice_after_add_and_remove(self):
+        """Тест выбора лучших креативов после добавления и удаления."""
+        rotator = CreativeRotator(self.test_creatives)
+
+        rotator.add_creative({
+            "ad_id": "ad_4",
+            "ad_name": "Creative D",
+            "impressions": 100,
+            "clicks": 20,
+            "spend": 2.0
+        })
+        self.assertEqual(rotator.choose_next("best_ctr")['ad_id'], "ad_4")
+        self.assertEqual(rotator.choose_next("lowest_cpc")['ad_id'], "ad_4")
+
+        rotator.remove_creative("ad_4")
+        self.assertEqual(rotator.choose_next("best_ctr")['ad_id'], "ad_1")
+        self.assertEqual(rotator.choose_next("lowest_cpc")['ad_id'], "ad_1")
+
+        rotator.remove_creative("ad_1")
+        self.assertEqual(rotator.choose_next("best_ctr")['ad_id'], "ad_3")
+
+    def test_best_choice_is_computed_once(self):
+        """Тест однократного поиска лучшего креатива до удаления лучшего."""
+        rotator = CreativeRotator(self.test_creatives)
+
+        with unittest.mock.patch.object(CreativeRotator, "_arg_best",
+                                        wraps=CreativeRotator._arg_best) as arg_best:
+            for _ in range(5):
+                rotator.choose_next("best_ctr")
+            self.assertEqual(arg_best.call_count, 1)
+
+            # Добавление и удаление не лучшего креатива обновляют индекс без поиска
+            rotator.add_creative({
+                "ad_id": "ad_4", "ad_name": "Creative D", "impressions": 100, "clicks": 20, "spend": 2.0
+            })
+            self.assertEqual(rotator.choose_next("best_ctr")['ad_id'], "ad_4")
+            rotator.remove_creative("ad_2")
+            self.assertEqual(rotator.choose_next("best_ctr")['ad_id'], "ad_4")
+            self.assertEqual(arg_best.call_count, 1)
+
+            # Удаление лучшего требует нового поиска
+            rotator.remove_creative("ad_4")
+            self.assertEqual(rotator.choose_next("best_ctr")['ad_id'], "ad_1")
+            self.assertEqual(arg_best.call_count, 2)
+
+    def test_incremental_best_matches_full_scan(self):
+        """Тест совпадения обновляемых индексов лучших креативов с полным поиском."""
+        rotator = CreativeRotator(self.test_creatives)
+        rotator.choose_next("best_ctr")
+        rotator.choose_next("lowest_cpc")
+
+        # Повторяющиеся метрики проверяют выбор первого индекса при равенстве
+        for i in range(4, 30):
+            rotator.add_creative({
+                "ad_id": f"ad_{i}", "ad_name": f"Creative {i}",
+                "impressions": (i % 4) * 100, "clicks": i % 3, "spend": float(i % 5)
+            })
+            if i % 4 == 0:
+                rotator.remove_creative(f"ad_{i // 2}")
+
+            # None - удален лучший креатив, индекс будет найден заново
+            with self.subTest(i=i):
+                self.assertIn(rotator._best_ctr_idx, (None, CreativeRotator._arg_best(rotator._ctr, True)))
+                self.assertIn(rotator._best_cpc_idx, (None, CreativeRotator._arg_best(rotator._cpc, False)))
+
+            rotator.choose_next("best_ctr")
+            rotator.choose_next("lowest_cpc")
+
+    def test_rotation_stats_extrema(self):
+        """Тест лучших и худших креативов в статистике после изменений."""
+        rotator = CreativeRotator(self.test_creatives)
+        rotator.add_creative({
+            "ad_id": "ad_4",
+            "ad_name": "Creative D",
+            "impressions": 100,
+            "clicks": 0,
+            "spend": 5.0
+        })
+        rotator.remove_creative("ad_3")
+        stats = rotator.get_rotation_stats()
+
+        self.assertEqual(stats['total_creatives'], 3)
+        self.assertEqual(stats['total_impressions'], 3100)
+        self.assertEqual(stats['best_performing']['ctr']['ad_id'], "ad_1")
+        self.assertEqual(stats['worst_performing']['ctr']['ad_id'], "ad_4")
+        # ad_4 без кликов не участвует в сравнении CPC
+        self.assertEqual(stats['best_performing']['cpc']['ad_id'], "ad_1")
+        self.assertEqual(stats['worst_performing']['cpc']['ad_id'], "ad_1")
+
+    def test_rotation_stats_are_cached_until_change(self):
+        """Тест кэширования статистики до изменения набора креативов."""
+        rotator = CreativeRotator(self.test_creatives)
+
+        with unittest.mock.patch.object(rotator, "_compute_rotation_stats",
+                                        wraps=rotator._compute_rotation_stats) as compute:
+            stats = rotator.get_rotation_stats()
+            self.assertEqual(rotator.get_rotation_stats(), stats)
+
+            rotator.remove_creative("nonexistent")
+            self.assertEqual(rotator.get_rotation_stats(), stats)
+            self.assertEqual(compute.call_count, 1)
+
+            rotator.remove_creative("ad_2")
+            updated = rotator.get_rotation_stats()
+            self.assertEqual(compute.call_count, 2)
+        self.assertEqual(updated['total_creatives'], 2)
+
+    def test_rotation_stats_mutation_does_not_leak(self):
+        """Тест независимости результата статистики от кэша."""
+        rotator = CreativeRotator(self.test_creatives)
+
+        stats = rotator.get_rotation_stats()
+        best_ctr_id = stats['best_performing']['ctr']['ad_id']
+        stats['total_creatives'] = 0
+        stats['best_performing']['ctr']['ad_id'] = "changed"
+        stats['worst_performing'].clear()
+
+        fresh = rotator.get_rotation_stats()
+        self.assertEqual(fresh['total_creatives'], 3)
+        self.assertEqual(fresh['best_performing']['ctr']['ad_id'], best_ctr_id)
+        self.assertIn('cpc', fresh['worst_performing'])
+
     def test_add_creative(self):
         """Тест добавления креатива."""
         rotator = CreativeRotator(self.test_creatives)
@@ -210,7 +470,16 @@ class TestCreativeRotator(unittest.TestCase):
 
         self.assertEqual(len(rotator.creatives), initial_count + 1)
         self.assertEqual(rotator.creatives[-1]['ad_id'], "ad_4")
-        self.assertEqual(rotator.creatives[-1]['ctr'], 4.0)  # (32/800)*100
+        self.assertEqual(rotator.creatives[-1]['ctr'], 4.0)  # 32*100/800
+
+    def test_add_duplicate_creative(self):
+        """Тест отказа при добавлении креатива с существующим ad_id."""
+        rotator = CreativeRotator(self.test_creatives)
+        with self.assertRaises(ValueError):
+            rotator.add_creative(dict(self.test_creatives[0]))
+
+        self.assertEqual(len(rotator.creatives), len(self.test_creatives))
+        self.assertEqual(len(rotator.ad_ids), len(self.test_creatives))
 
     def test_remove_creative(self):
         """Тест удаления креатива."""
@@ -224,53 +493,111 @@ class TestCreativeRotator(unittest.TestCase):
         self.assertEqual(len(rotator.creatives), initial_count - 1)
 
         # Проверяем что креатив действительно удален
-        ad_ids = [c['ad_id'] for c in rotator.creatives]
-        self.assertNotIn("ad_2", ad_ids)
+        self.assertNotIn("ad_2", rotator.ad_ids)
+        self.assertEqual(set(rotator.ad_ids), {"ad_1", "ad_3"})
 
         # Пытаемся удалить несуществующий креатив
         result = rotator.remove_creative("nonexistent")
         self.assertFalse(result)
 
-    def test_simulation(self):
-        """Тест симуляции ротации."""
+    def test_remove_keeps_index_consistent(self):
+        """Тест согласованности индекса после удаления с переносом последнего креатива."""
         rotator = CreativeRotator(self.test_creatives)
 
-        # Тестируем симуляцию на 5 итераций
-        simulation = rotator.simulate_rotation(5, "round_robin")
-
-        self.assertEqual(len(simulation), 5)
+        self.assertTrue(rotator.remove_creative("ad_1"))
+        self.assertEqual(sorted(c['ad_id'] for c in rotator.creatives), ["ad_2", "ad_3"])
 
-        # Проверяем структуру каждой итерации
-        for i, iteration in enumerate(simulation):
-            self.assertEqual(iteration['iteration'], i + 1)
-            self.assertIn('chosen_creative', iteration)
-            self.assertIn('ad_id', iteration['chosen_creative'])
+        # ad_3 перенесен на место ad_1 и должен удаляться по новому индексу
+        self.assertTrue(rotator.remove_creative("ad_3"))
+        self.assertEqual([c['ad_id'] for c in rotator.creatives], ["ad_2"])
+        self.assertEqual(rotator.get_rotation_stats()['total_impressions'], 2000)
+        self.assertFalse(rotator.remove_creative("ad_3"))
 
-    def test_invalid_strategy(self):
-        """Тест обработки неверной стратегии."""
+    def test_round_robin_after_mutation_and_simulation(self):
+        """Тест продолжения round robin после изменения набора и симуляции."""
         rotator = CreativeRotator(self.test_creatives)
+        rotator.choose_next("round_robin")
 
-        with self.assertRaises(ValueError):
-            rotator.choose_next("invalid_strategy")
+        # Изменение набора не сбрасывает позицию перебора
+        rotator.add_creative({
+            "ad_id": "ad_4", "ad_name": "Ad 4", "impressions": 100, "clicks": 1, "spend": 1.0
+        })
+        self.assertEqual(rotator.choose_next("round_robin")['ad_id'], "ad_2")
+        self.assertEqual(rotator.choose_next("round_robin")['ad_id'], "ad_3")
 
-    def test_reset_round_robin(self):
-        """Тест сброса индекса round_robin."""
-        rotator = CreativeRotator(self.test_creatives)
+        # Позиция за концом списка после удаления - перебор с начала
+        rotator.remove_creative("ad_4")
+        self.assertEqual(rotator.choose_next("round_robin")['ad_id'], "ad_1")
 
-        # Делаем несколько выборов
-        rotator.choose_next("round_robin")
-        rotator.choose_next("round_robin")
+        # Удаление креатива на текущей позиции: на его место встает последний
+        rotator.remove_creative("ad_2")
+        self.assertEqual(rotator.choose_next("round_robin")['ad_id'], "ad_3")
 
-        # Индекс должен быть 2
-        self.assertEqual(rotator._round_robin_index, 2)
+        # После симуляции перебор продолжается с места остановки
+        rotator.simulate_rotation(5, "round_robin")
+        self.assertEqual(rotator.choose_next("round_robin")['ad_id'], "ad_3")
 
-        # Сбрасываем
-        rotator.reset_round_robin()
-        self.assertEqual(rotator._round_robin_index, 0)
+    def test_prepared_creatives_are_shared_between_rotators(self):
+        """Тест повторного использования подготовленных креативов для одинаковых наборов."""
+        rotator = CreativeRotator(self.test_creatives)
+        other = CreativeRotator([dict(creative) for creative in self._TEMPLATE])
+        self.assertIs(rotator.creatives[0], other.creatives[0])
+
+        # Списки креативов у ротаторов собственные
+        rotator.remove_creative("ad_1")
+        self.assertEqual(len(other.creatives), 3)
+
+    def test_prepared_creatives_keep_value_types(self):
+        """Тест кэша подготовки для равных значений разных типов (1, 1.0, True)."""
+        for value in (1, 1.0, True):
+            with self.subTest(value=value):
+                rotator = CreativeRotator([{
+                    "ad_id": "ad_1", "ad_name": "Ad 1", "impressions": 10, "clicks": value, "spend": value
+                }])
+                creative = rotator.creatives[0]
+                self.assertIs(type(creative.clicks), type(value))
+                self.assertIs(type(creative.spend), type(value))
+
+    def test_columns_match_prepared_creatives(self):
+        """Тест колонок метрик, собранных при подготовке креативов."""
+        creatives = [
+            {"ad_id": "ad_1", "ad_name": "Ad 1", "impressions": 1000, "clicks": 50, "spend": 25.0},
+            {"ad_id": "ad_2", "ad_name": "Ad 2", "impressions": 0, "clicks": 0, "spend": 0.0},
+            {"ad_id": "ad_3", "ad_name": "Ad 3", "impressions": 500, "clicks": 0, "spend": 5.0,
+             "ctr": 7.5, "cpc": 3.0},
+            {"ad_id": "ad_4", "ad_name": "Ad 4", "impressions": 200, "clicks": 4, "spend": 2.0,
+             "ctr": 9.0, "cpc": 0.25},
+        ]
+        rotator = CreativeRotator(creatives)
+
+        np.testing.assert_array_equal(rotator._impr, [1000, 0, 500, 200])
+        np.testing.assert_array_equal(rotator._clicks, [50, 0, 0, 4])
+        np.testing.assert_array_equal(rotator._spend, [25.0, 0.0, 5.0, 2.0])
+        np.testing.assert_array_equal(rotator._ctr, [5.0, math.nan, 7.5, 9.0])
+        np.testing.assert_array_equal(rotator._cpc, [0.5, math.nan, math.nan, 0.25])
+        self.assertEqual(rotator._impr.dtype, np.int64)
+
+        # Колонки из кэша подготовки у каждого ротатора свои
+        rotator.remove_creative("ad_1")
+        other = CreativeRotator(creatives)
+        np.testing.assert_array_equal(other._impr, [1000, 0, 500, 200])
+
+    def test_columns_follow_many_additions_and_removals(self):
+        """Тест синхронности колонок метрик при росте и уменьшении набора."""
+        rotator = CreativeRotator(self.test_creatives)
+        for i in range(4, 40):
+            rotator.add_creative({
+                "ad_id": f"ad_{i}", "ad_name": f"Creative {i}",
+                "impressions": 100 * i, "clicks": i, "spend": float(i)
+            })
+        for i in range(4, 40, 3):
+            rotator.remove_creative(f"ad_{i}")
 
-        # Следующий выбор должен быть первый креатив
-        choice = rotator.choose_next("round_robin")
-        self.assertEqual(choice['ad_id'], "ad_1")
+        stats = rotator.get_rotation_stats()
+        self.assertEqual(stats['total_creatives'], len(rotator.creatives))
+        self.assertEqual(stats['total_impressions'], sum(c.impressions for c in rotator.creatives))
+        self.assertEqual(stats['total_clicks'], sum(c.clicks for c in rotator.creatives))
+        self.assertEqual(rotator.choose_next("best_ctr")['ad_id'], "ad_1")
 
 
 if __name__ == '__main__':